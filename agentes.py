@@ -1,209 +1,889 @@
 # agentes.py
-from modelo import Museo
+from modelo import Museo, VelocidadNula
+from estado import EstadoCamaras
+from cobertura import CacheEvaluacion
+from inicializacion import INICIALIZADORES
+from plano import cargar_plano, plano_desde_json
+from punto_control import PuntoControl
+from enfriamiento import ENFRIAMIENTOS, EnfriamientoGeometrico, calibrar_temperaturas, crear_enfriamiento
+from instrumentacion import Instrumentacion, INSTRUMENTACION_NULA, perfilar
+from telemetria import Telemetria, TELEMETRIA_NULA, volcar_jsonl
+from minimizacion import MinimizadorCamaras
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
 import random
 import math
+import sys
+import threading
 import time
 
+
+def validar_resoluciones(resoluciones):
+    """Comprueba un calendario de resoluciones [(factor, paso), ...].
+
+    Cada nivel evalúa sobre una rejilla de paso ``factor`` con movimientos
+    de ``paso`` metros; el último debe ser a resolución completa (factor 1)
+    para que las áreas finales sean comparables.
+    """
+    resoluciones = [(int(factor), paso) for factor, paso in resoluciones]
+    if not resoluciones:
+        raise ValueError("El calendario de resoluciones no puede estar vacío")
+    if any(factor < 1 or paso <= 0 for factor, paso in resoluciones):
+        raise ValueError("Los factores deben ser >= 1 y los pasos positivos")
+    if resoluciones[-1][0] != 1:
+        raise ValueError("El último nivel del calendario debe tener factor 1")
+    return resoluciones
+
+
+def _leer_resoluciones(texto):
+    """'4:20,2:10,1:5' -> [(4, 20), (2, 10), (1, 5)] (argumento de línea de comandos)"""
+    try:
+        return validar_resoluciones(tuple(int(v) for v in nivel.split(":")) for nivel in texto.split(","))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"calendario inválido {texto!r}: {e}")
+
+
+def _configuracion_museo(museo):
+    plano = museo.plano
+    return {'tamano': museo.tamano, 'num_camaras': museo.num_camaras, 'radio': museo.radio,
+            'cobertura': museo.cobertura.nombre, 'inicializacion': museo.inicializador.nombre,
+            'plano': (plano.contorno, plano.obstaculos) if plano is not None else None,
+            'vision': museo.vision}
+
+
+def _comprobar_configuracion(guardada, actual):
+    """El punto de control debe ser de la misma búsqueda (mismos parámetros)"""
+    distintos = sorted(k for k in set(guardada) | set(actual) if guardada.get(k) != actual.get(k))
+    if distintos:
+        raise ValueError(f"El punto de control es de otra búsqueda (difiere: {', '.join(distintos)})")
+
+
 class AgenteHillClimbing:
     """Hill Climbing con Reinicios Aleatorios"""
-    def __init__(self, museo, interfaz):
+    RESOLUCIONES = [(1, 5)]
+    
+    def __init__(self, museo, interfaz, semilla=None, trabajadores=1, cache=None,
+                 instrumentacion=None, resoluciones=None, punto_control=None, reanudar=False,
+                 telemetria=None, estado_inicial=None):
         self.museo = museo
         self.interfaz = interfaz
+        self.cache = cache  # CacheEvaluacion compartida entre reinicios (mismo proceso)
+        self.instrumentacion = instrumentacion if instrumentacion is not None else INSTRUMENTACION_NULA
+        museo.instrumentacion = self.instrumentacion
+        self.telemetria = telemetria if telemetria is not None else TELEMETRIA_NULA
         self.max_restarts = 20
+        # De grueso a fino: [(factor de la rejilla, paso del movimiento en m), ...]
+        self.resoluciones = validar_resoluciones(resoluciones or self.RESOLUCIONES)
+        self.semilla = semilla
+        self.trabajadores = trabajadores  # > 1: reinicios en procesos paralelos
+        self.punto_control = punto_control  # PuntoControl: guardado periódico del progreso
+        self.reanudar = reanudar
+        self.estado_inicial = estado_inicial  # arranque en caliente del primer reinicio
+        self.rng = random.Random(semilla)
+        self._progreso = None  # reinicio en curso (para el punto de control)
         self.mejor_global = None
         self.valor_global = -1
+        self.reinicios = []
+        self.evaluaciones = 0
+        self.historial = []  # mejoras del mejor global: tiempo, evaluaciones, área
         self.tiempo_ejecucion = 0
         
     def buscar(self):
         """RANDOM-RESTART HILL-CLIMBING"""
         self.interfaz.log("="*50)
         self.interfaz.log("🚀 INICIANDO HILL CLIMBING...")
-        inicio = time.time()
+        self.telemetria.inicio("Hill Climbing")
+        inicio = self._inicio = time.time()
         
-        for restart in range(self.max_restarts):
-            self.interfaz.log(f"🔁 Reinicio {restart + 1}/{self.max_restarts}")
-            
-            estado = self._generar_estado_aleatorio()
-            valor = self._evaluar(estado)
-            
-            while True:
-                self.museo.camaras = estado
-                self.interfaz.actualizar_visualizacion()
-                self.interfaz.actualizar_stats(
-                    iteracion=restart + 1,
-                    area_actual=valor,
-                    mejor_area=self.valor_global,
-                    algoritmo="Hill Climbing"
-                )
-                
-                sucesores = self.museo.generar_vecinos(estado)
-                if not sucesores:
-                    break
-                
-                mejor_sucesor = max(sucesores, key=self._evaluar)
-                mejor_valor = self._evaluar(mejor_sucesor)
-                
-                if mejor_valor <= valor:  # Máximo local alcanzado
+        # Una semilla por reinicio: el resultado no depende del número de procesos
+        maestro = random.Random(self.semilla)
+        self.semillas = [maestro.getrandbits(64) for _ in range(self.max_restarts)]
+        self.reinicios = []
+        self.historial = []
+        progreso = self._reanudar() if self.reanudar else None
+        inicio = self._inicio
+        primero = len(self.reinicios)
+        pendientes = range(primero, self.max_restarts)
+        
+        if self.trabajadores > 1:
+            self.interfaz.log(f"⚙️ {len(pendientes)} reinicios en {self.trabajadores} procesos")
+            with ProcessPoolExecutor(max_workers=self.trabajadores) as ejecutor:
+                resultados = ejecutor.map(_reinicio_hill_climbing,
+                                          [self.museo] * len(pendientes),
+                                          self.semillas[primero:], pendientes,
+                                          [self.instrumentacion.activa] * len(pendientes),
+                                          [self.resoluciones] * len(pendientes),
+                                          [progreso] + [None] * (len(pendientes) - 1),
+                                          [self.estado_inicial] * len(pendientes))
+                for restart, (estado, valor, stats) in zip(pendientes, resultados):
+                    self.interfaz.log(f"🔁 Reinicio {restart + 1}/{self.max_restarts} - Área: {valor:.1f} m²")
+                    if 'instrumentacion' in stats:
+                        self.instrumentacion.fusionar(stats.pop('instrumentacion'))
+                    self._registrar_reinicio(estado, valor, stats)
+                    self.museo.camaras = self.mejor_global
+                    self.interfaz.actualizar_visualizacion()
+                    self.interfaz.actualizar_stats(
+                        iteracion=restart + 1,
+                        area_actual=valor,
+                        mejor_area=self.valor_global,
+                        algoritmo="Hill Climbing"
+                    )
+                    # En paralelo solo se guarda entre reinicios completos
+                    self._guardar_punto_control(forzar=True)
+                    self.telemetria.iteracion(restart + 1, valor, self.valor_global,
+                                              sum(r['evaluaciones'] for r in self.reinicios))
+                    if self.telemetria.detenida:
+                        ejecutor.shutdown(cancel_futures=True)
+                        break
+        else:
+            for restart in pendientes:
+                if self.telemetria.detenida:
                     break
-                
-                estado = mejor_sucesor
-                valor = mejor_valor
-                self.interfaz.velocidad.sleep()
-            
-            if valor > self.valor_global:
-                self.valor_global = valor
-                self.mejor_global = estado
+                self._registrar_reinicio(*self._escalar(self.semillas[restart], restart, progreso))
+                progreso = None
+                self._guardar_punto_control()
         
         self.tiempo_ejecucion = time.time() - inicio
+        self.evaluaciones = sum(r['evaluaciones'] for r in self.reinicios)
+        self._guardar_punto_control(forzar=True)
         self.museo.camaras = self.mejor_global
+        if self.telemetria.detenida:
+            self.interfaz.log("⏹️ Búsqueda detenida")
         self.interfaz.log(f"🏁 FIN HILL CLIMBING - Área: {self.valor_global:.1f} m²")
         
-        return {
+        resultado = {
             'algoritmo': 'Hill Climbing',
             'area': self.valor_global,
             'tiempo': self.tiempo_ejecucion,
-            'iteraciones': self.max_restarts,
-            'solucion': self.mejor_global
+            'iteraciones': len(self.reinicios),
+            'solucion': list(self.mejor_global),
+            'evaluaciones': self.evaluaciones,
+            'historial': self.historial,
+            'reinicios': self.reinicios,
+            'cache': self.cache.estadisticas() if self.cache is not None else None,
+            'instrumentacion': self.instrumentacion.resumen()
         }
+        self.telemetria.fin(resultado)
+        return resultado
     
-    def _generar_estado_aleatorio(self):
-        """Genera estado inicial válido"""
-        camaras = []
-        intentos = 0
-        while len(camaras) < self.museo.num_camaras and intentos < 500:
-            x = random.randint(self.museo.radio, self.museo.tamano - self.museo.radio)
-            y = random.randint(self.museo.radio, self.museo.tamano - self.museo.radio)
-            posicion = (x, y)
-            if all(not self.museo.hay_solapamiento(posicion, c) for c in camaras):
-                camaras.append(posicion)
-            intentos += 1
-        return camaras
+    def _registrar_reinicio(self, estado, valor, stats):
+        """Guarda las estadísticas del reinicio y actualiza el mejor global"""
+        self.reinicios.append(stats)
+        if valor > self.valor_global:
+            self.valor_global = valor
+            self.mejor_global = estado
+            self.historial.append({
+                'tiempo': time.time() - self._inicio,
+                'evaluaciones': sum(r['evaluaciones'] for r in self.reinicios),
+                'area': valor
+            })
     
-    def _evaluar(self, estado):
-        """Función objetivo"""
-        temp = self.museo.camaras
-        self.museo.camaras = estado
-        area = self.museo.calcular_area_cubierta()
-        self.museo.camaras = temp
-        return area
+    def _configuracion(self):
+        """Parámetros que deben coincidir para reanudar desde un punto de control"""
+        return {'algoritmo': 'hc', 'museo': _configuracion_museo(self.museo), 'semilla': self.semilla,
+                'max_restarts': self.max_restarts, 'resoluciones': self.resoluciones}
+    
+    def _guardar_punto_control(self, forzar=False):
+        """Escribe el estado completo de la búsqueda si toca (o si se fuerza)"""
+        if self.punto_control is None or not (forzar or self.punto_control.toca()):
+            return
+        progreso = None
+        if self._progreso is not None:
+            progreso = dict(self._progreso,
+                            evaluaciones=self.evaluaciones - self._evaluaciones_reinicio,
+                            tiempo=time.time() - self._inicio_reinicio)
+        self.punto_control.guardar({
+            'configuracion': self._configuracion(),
+            'semillas': self.semillas,
+            'reinicios': self.reinicios,
+            'mejor_global': self.mejor_global,
+            'valor_global': self.valor_global,
+            'historial': self.historial,
+            'tiempo': time.time() - self._inicio,
+            'progreso': progreso
+        })
+    
+    def _reanudar(self):
+        """Restaura la búsqueda desde el punto de control; devuelve el reinicio a medias o None"""
+        datos = self.punto_control.cargar() if self.punto_control is not None else None
+        if datos is None:
+            self.interfaz.log("💾 Sin punto de control previo: se empieza desde cero")
+            return None
+        _comprobar_configuracion(datos['configuracion'], self._configuracion())
+        self.semillas = datos['semillas']
+        self.reinicios = datos['reinicios']
+        self.mejor_global = datos['mejor_global']
+        self.valor_global = datos['valor_global']
+        self.historial = datos['historial']
+        self._inicio = time.time() - datos['tiempo']
+        progreso = datos['progreso']
+        self.evaluaciones = sum(r['evaluaciones'] for r in self.reinicios)
+        if progreso is not None:
+            self.evaluaciones += progreso['evaluaciones']
+        self.interfaz.log(f"💾 Reanudando tras {len(self.reinicios)}/{self.max_restarts} reinicios")
+        return progreso
+    
+    def _escalar(self, semilla, restart, progreso=None):
+        """Un reinicio completo: estado aleatorio y ascenso hasta máximo local en cada resolución.
+        
+        ``progreso`` (de un punto de control) retoma un reinicio que quedó a medias.
+        """
+        if progreso is None:
+            self.interfaz.log(f"🔁 Reinicio {restart + 1}/{self.max_restarts}")
+            self.rng = random.Random(semilla)
+            if restart == 0 and self.estado_inicial is not None:
+                estado = EstadoCamaras(self.estado_inicial)
+            else:
+                estado = self.museo.generar_estado_inicial(self.rng)
+            progreso = {'reinicio': restart, 'semilla': semilla, 'nivel': 0, 'niveles': [],
+                        'estado': estado, 'seguidor': None,
+                        'pasos': 0, 'pasos_nivel': 0, 'evaluaciones': 0, 'evaluaciones_nivel': 0,
+                        'tiempo': 0.0}
+        else:
+            self.interfaz.log(f"🔁 Reinicio {restart + 1}/{self.max_restarts} (reanudado)")
+        self._progreso = progreso
+        self._inicio_reinicio = time.time() - progreso['tiempo']
+        self._evaluaciones_reinicio = self.evaluaciones - progreso['evaluaciones']
+        
+        indice = self.museo.crear_indice(progreso['estado'])
+        while progreso['nivel'] < len(self.resoluciones):
+            factor, paso = self.resoluciones[progreso['nivel']]
+            self._ascender(progreso, indice, factor, paso, restart)
+            evaluaciones = self.evaluaciones - self._evaluaciones_reinicio
+            progreso['niveles'].append({'factor': factor, 'paso': paso, 'area': progreso['area'],
+                                        'pasos': progreso['pasos_nivel'],
+                                        'evaluaciones': evaluaciones - progreso['evaluaciones_nivel']})
+            progreso.update(nivel=progreso['nivel'] + 1, seguidor=None, pasos_nivel=0,
+                            evaluaciones_nivel=evaluaciones)
+            if self.telemetria.detenida:
+                if factor != 1:
+                    # Detenida en un nivel grueso: área final a resolución completa
+                    progreso['area'] = self.museo.crear_seguidor(progreso['estado']).area
+                    self.evaluaciones += 1
+                break
+        self._progreso = None
+        
+        stats = {
+            'reinicio': restart + 1,
+            'semilla': semilla,
+            'area': progreso['area'],
+            'pasos': progreso['pasos'],
+            'evaluaciones': self.evaluaciones - self._evaluaciones_reinicio,
+            'tiempo': time.time() - self._inicio_reinicio,
+            'niveles': progreso['niveles']
+        }
+        return progreso['estado'], progreso['area'], stats
+    
+    def _ascender(self, progreso, indice, factor, paso, restart):
+        """Ascenso con movimientos de ``paso`` m evaluados en la rejilla de paso ``factor``.
+        
+        Avanza ``progreso`` (estado, área, pasos) en cada movimiento aceptado.
+        """
+        # La caché guarda áreas a resolución completa: no se usa en niveles gruesos
+        cache = self.cache if factor == 1 else None
+        estado = progreso['estado']
+        seguidor = self.museo.crear_seguidor(estado, factor)
+        clave = cache.clave(estado) if cache is not None else None
+        if progreso['seguidor'] is None:
+            self.evaluaciones += 1
+            if cache is not None:
+                cache.guardar(clave, seguidor.area)
+        else:
+            # Mismo valor que antes de guardar (el área exacta acumula redondeos)
+            seguidor.area, seguidor.impactos = progreso['seguidor']
+        valor = progreso['area'] = seguidor.area
+        progreso['seguidor'] = (seguidor.area, seguidor.impactos)
+        
+        while True:
+            with self.instrumentacion.fase('interfaz'):
+                self.museo.camaras = estado
+                self.museo.solapamientos = seguidor.solapamientos
+                self.interfaz.actualizar_visualizacion()
+                self.interfaz.actualizar_stats(
+                    iteracion=restart + 1,
+                    area_actual=valor,
+                    mejor_area=self.valor_global,
+                    algoritmo="Hill Climbing"
+                )
+            self.telemetria.iteracion(restart + 1, valor,
+                                      max(valor, self.valor_global) if factor == 1 else self.valor_global,
+                                      self.evaluaciones)
+            if self.telemetria.detenida:
+                break
+            
+            mejor_movimiento, mejor_valor = self._mejor_movimiento_lote(estado, seguidor, paso,
+                                                                        cache, clave)
+            if mejor_movimiento is None:
+                break
+            
+            if mejor_valor <= valor:  # Máximo local alcanzado
+                self.instrumentacion.contar('maximos_locales')
+                break
+            
+            i, nueva_pos = mejor_movimiento
+            seguidor.mover(i, nueva_pos)
+            seguidor.confirmar()
+            indice.mover(i, nueva_pos)
+            if cache is not None:
+                clave = cache.clave_movimiento(clave, estado[i], nueva_pos)
+            estado[i] = nueva_pos  # en el sitio: cada reinicio es dueño de su estado
+            valor = mejor_valor
+            progreso.update(estado=estado, area=valor, seguidor=(seguidor.area, seguidor.impactos),
+                            pasos=progreso['pasos'] + 1, pasos_nivel=progreso['pasos_nivel'] + 1)
+            self.instrumentacion.contar('aceptados')
+            self._guardar_punto_control()
+            with self.instrumentacion.fase('espera'):
+                self.interfaz.velocidad.sleep()
+    
+    def _mejor_movimiento_lote(self, estado, seguidor, paso, cache=None, clave=None):
+        """Vecindario completo evaluado en lote: ((i, nueva_pos), área) del mejor o (None, -1).
+        
+        Con ``cache`` (y la ``clave`` de ``estado``) solo se evalúan los sucesores
+        que no están en ella.
+        """
+        indices, dx, dy = self.museo.movimientos_lote(estado, paso)
+        if not indices:
+            return None, -1
+        destinos = [(estado[i][0] + dx[k], estado[i][1] + dy[k]) for k, i in enumerate(indices)]
+        if cache is None:
+            with self.instrumentacion.fase('evaluacion'):
+                areas = seguidor.areas_movimientos(indices, dx, dy)
+        else:
+            claves = [cache.clave_movimiento(clave, estado[i], destino)
+                      for i, destino in zip(indices, destinos)]
+            areas = [cache.obtener(c) for c in claves]
+            pendientes = [k for k, area in enumerate(areas) if area is None]
+            if pendientes:
+                with self.instrumentacion.fase('evaluacion'):
+                    nuevas = seguidor.areas_movimientos([indices[k] for k in pendientes],
+                                                        [dx[k] for k in pendientes],
+                                                        [dy[k] for k in pendientes])
+                for k, area in zip(pendientes, nuevas):
+                    areas[k] = area
+                    cache.guardar(claves[k], area)
+        self.evaluaciones += len(areas)
+        k = max(range(len(areas)), key=areas.__getitem__)  # el primero en caso de empate
+        return (indices[k], destinos[k]), areas[k]
+
+
+def _reinicio_hill_climbing(museo, semilla, restart, instrumentar=False, resoluciones=None,
+                           progreso=None, estado_inicial=None):
+    """Ejecuta un reinicio de Hill Climbing en un proceso trabajador"""
+    agente = AgenteHillClimbing(museo, InterfazNula(),
+                                instrumentacion=Instrumentacion() if instrumentar else None,
+                                resoluciones=resoluciones, estado_inicial=estado_inicial)
+    if progreso is not None:
+        agente.evaluaciones = progreso['evaluaciones']
+    estado, valor, stats = agente._escalar(semilla, restart, progreso)
+    if instrumentar:
+        stats['instrumentacion'] = agente.instrumentacion.resumen()
+    return estado, valor, stats
 
 
 class AgenteSimulatedAnnealing:
     """Simulated Annealing"""
-    def __init__(self, museo, interfaz):
+    RESOLUCIONES = [(1, 10)]
+    
+    def __init__(self, museo, interfaz, semilla=None, cache=None, instrumentacion=None,
+                 resoluciones=None, punto_control=None, reanudar=False, calendario=None,
+                 calibrar=False, presupuesto_tiempo=None, presupuesto_evaluaciones=None,
+                 telemetria=None, estado_inicial=None):
         self.museo = museo
         self.interfaz = interfaz
+        self.semilla = semilla
+        self.cache = cache
+        self._clave = None  # clave de caché del estado en curso
+        self.telemetria = telemetria if telemetria is not None else TELEMETRIA_NULA
+        self.punto_control = punto_control  # PuntoControl: guardado periódico del progreso
+        self.reanudar = reanudar
+        self.estado_inicial = estado_inicial  # arranque en caliente en lugar del inicializador
+        self.instrumentacion = instrumentacion if instrumentacion is not None else INSTRUMENTACION_NULA
+        museo.instrumentacion = self.instrumentacion
+        self.rng = random.Random(semilla)
         self.temp_inicial = 1000
+        self.temp_final = 0.1
         self.enfriamiento = 0.95
+        # Enfriamiento: geométrico por defecto; calibrar estima T0 y Tf con deltas muestreados
+        self.calendario = calendario if calendario is not None else EnfriamientoGeometrico(self.enfriamiento)
+        self.calibrar = calibrar
+        self.presupuesto_tiempo = presupuesto_tiempo  # segundos
+        self.presupuesto_evaluaciones = presupuesto_evaluaciones
+        self.parada = None  # qué detuvo la búsqueda: 'temperatura', 'tiempo' o 'evaluaciones'
+        # De grueso a fino: [(factor de la rejilla, desplazamiento máximo en m), ...]
+        self.resoluciones = validar_resoluciones(resoluciones or self.RESOLUCIONES)
+        self.desplazamiento = self.resoluciones[-1][1]
         self.mejor_global = None
         self.valor_global = -1
+        self.evaluaciones = 0
+        self.historial = []  # mejoras del mejor global: tiempo, evaluaciones, área
         self.tiempo_ejecucion = 0
         
     def buscar(self):
         """SIMULATED ANNEALING"""
         self.interfaz.log("="*50)
         self.interfaz.log("🚀 INICIANDO SIMULATED ANNEALING...")
-        inicio = time.time()
+        self.telemetria.inicio("Simulated Annealing")
+        datos = self._reanudar() if self.reanudar else None
+        if datos is None:
+            inicio = time.time()
+            if self.estado_inicial is not None:
+                self.mejor_global = EstadoCamaras(self.estado_inicial)
+            else:
+                self.mejor_global = self.museo.generar_estado_inicial(self.rng)
+            self.historial = []
+            self.parada = None
+            self._rango = self._calibrar() if self.calibrar else (self.temp_inicial, self.temp_final)
+            self.calendario.reiniciar(*self._rango)
+            temperatura = self._rango[0]
+            iteracion = 0
+            primero, en_curso = 0, None
+        else:
+            inicio = time.time() - datos['tiempo']
+            temperatura = datos['temperatura']
+            iteracion = datos['iteracion']
+            primero, en_curso = datos['nivel'], datos['en_curso']
+        
+        temp_inicial, temp_final = self._rango
+        for nivel in range(primero, len(self.resoluciones)):
+            factor, desplazamiento = self.resoluciones[nivel]
+            # Cada nivel enfría un tramo igual (en escala logarítmica) del rango de temperaturas
+            temp_fin = temp_inicial * (temp_final / temp_inicial) ** ((nivel + 1) / len(self.resoluciones))
+            self.desplazamiento = desplazamiento
+            self._nivel = nivel
+            temperatura, iteracion = self._enfriar(factor, temperatura, temp_fin, iteracion, inicio,
+                                                   en_curso)
+            en_curso = None
+            if self.parada is not None:
+                if factor != 1:
+                    # Presupuesto agotado en un nivel grueso: área final a resolución completa
+                    self.valor_global = self.museo.crear_seguidor(self.mejor_global).area
+                    self.evaluaciones += 1
+                    self.historial.append({'tiempo': time.time() - inicio,
+                                           'evaluaciones': self.evaluaciones,
+                                           'area': self.valor_global})
+                self.interfaz.log("⏹️ Búsqueda detenida" if self.parada == 'detenida'
+                                  else f"⏱️ Presupuesto de {self.parada} agotado")
+                break
+        else:
+            self.parada = 'temperatura'
+        
+        self._nivel = len(self.resoluciones)
+        self._guardar_punto_control(inicio, temperatura, iteracion, forzar=True)
+        self.tiempo_ejecucion = time.time() - inicio
+        self.museo.camaras = self.mejor_global
+        self.interfaz.log(f"🏁 FIN SIMULATED ANNEALING - Área: {self.valor_global:.1f} m²")
         
-        estado_actual = self._generar_estado_aleatorio()
-        valor_actual = self._evaluar(estado_actual)
-        self.mejor_global = estado_actual
-        self.valor_global = valor_actual
+        resultado = {
+            'algoritmo': 'Simulated Annealing',
+            'area': self.valor_global,
+            'tiempo': self.tiempo_ejecucion,
+            'iteraciones': iteracion,
+            'solucion': list(self.mejor_global),
+            'evaluaciones': self.evaluaciones,
+            'historial': self.historial,
+            'enfriamiento': self.calendario.configuracion(),
+            'temperaturas': self._rango,
+            'recalentamientos': self.calendario.recalentados,
+            'parada': self.parada,
+            'cache': self.cache.estadisticas() if self.cache is not None else None,
+            'instrumentacion': self.instrumentacion.resumen()
+        }
+        self.telemetria.fin(resultado)
+        return resultado
+    
+    def _calibrar(self, muestras=100):
+        """(T0, Tf) estimados con los deltas de movimientos aleatorios desde el estado inicial"""
+        factor, self.desplazamiento = self.resoluciones[0]
+        estado = self.mejor_global
+        seguidor = self.museo.crear_seguidor(estado, factor)
+        indice = self.museo.crear_indice(estado)
+        self.evaluaciones += 1
+        deltas = []
+        for _ in range(muestras):
+            movimiento = self._movimiento_aleatorio(estado, indice)
+            if movimiento is not None:
+                deltas.append(self._evaluar_movimiento(estado, seguidor, *movimiento) - seguidor.area)
+        rango = calibrar_temperaturas(deltas)
+        if rango is None:
+            self.interfaz.log("🌡️ Sin empeoramientos en la muestra: se mantiene el rango por defecto")
+            return self.temp_inicial, self.temp_final
+        self.interfaz.log(f"🌡️ Temperaturas calibradas: T0={rango[0]:.2f}, Tf={rango[1]:.3f}")
+        return rango
+    
+    def _agotado(self, inicio):
+        """Marca ``parada`` y devuelve True si se ha consumido algún presupuesto o se pidió parar"""
+        if self.telemetria.detenida:
+            self.parada = 'detenida'
+        elif self.presupuesto_evaluaciones is not None and self.evaluaciones >= self.presupuesto_evaluaciones:
+            self.parada = 'evaluaciones'
+        elif self.presupuesto_tiempo is not None and time.time() - inicio >= self.presupuesto_tiempo:
+            self.parada = 'tiempo'
+        return self.parada is not None
+    
+    def _configuracion(self):
+        """Parámetros que deben coincidir para reanudar desde un punto de control"""
+        return {'algoritmo': 'sa', 'museo': _configuracion_museo(self.museo), 'semilla': self.semilla,
+                'temperaturas': (self.temp_inicial, self.temp_final, self.enfriamiento),
+                'calendario': self.calendario.configuracion(), 'calibrar': self.calibrar,
+                'resoluciones': self.resoluciones}
+    
+    def _guardar_punto_control(self, inicio, temperatura, iteracion, estado=None, valor=None,
+                               seguidor=None, forzar=False):
+        """Escribe el estado completo de la búsqueda (incluido el del RNG) si toca"""
+        if self.punto_control is None or not (forzar or self.punto_control.toca()):
+            return
+        self.punto_control.guardar({
+            'configuracion': self._configuracion(),
+            'rng': self.rng.getstate(),
+            'mejor_global': self.mejor_global,
+            'valor_global': self.valor_global,
+            'evaluaciones': self.evaluaciones,
+            'historial': self.historial,
+            'tiempo': time.time() - inicio,
+            'temperatura': temperatura,
+            'iteracion': iteracion,
+            'nivel': self._nivel,
+            'rango': self._rango,
+            'calendario': self.calendario,
+            'parada': self.parada,
+            'en_curso': (estado, valor, seguidor.area, seguidor.impactos) if seguidor is not None else None
+        })
+    
+    def _reanudar(self):
+        """Restaura el estado guardado; devuelve los datos del punto de control o None"""
+        datos = self.punto_control.cargar() if self.punto_control is not None else None
+        if datos is None:
+            self.interfaz.log("💾 Sin punto de control previo: se empieza desde cero")
+            return None
+        _comprobar_configuracion(datos['configuracion'], self._configuracion())
+        self.rng.setstate(datos['rng'])
+        self.mejor_global = datos['mejor_global']
+        self.valor_global = datos['valor_global']
+        self.evaluaciones = datos['evaluaciones']
+        self.historial = datos['historial']
+        self._rango = datos['rango']
+        self.calendario = datos['calendario']
+        self.parada = datos['parada']
+        self.interfaz.log(f"💾 Reanudando en la iteración {datos['iteracion']} (T={datos['temperatura']:.2f})")
+        return datos
+    
+    def _enfriar(self, factor, temperatura, temp_fin, iteracion, inicio, en_curso=None):
+        """Enfría hasta ``temp_fin`` evaluando en la rejilla de paso ``factor``.
         
-        temperatura = self.temp_inicial
-        iteracion = 0
+        Parte del mejor estado hasta el momento, reevaluado en esta resolución
+        (o de ``en_curso`` si se reanuda a mitad de nivel); devuelve
+        (temperatura, iteracion) para el nivel siguiente.
+        """
+        # La caché guarda áreas a resolución completa: no se usa en niveles gruesos
+        cache = self.cache if factor == 1 else None
+        if en_curso is not None:
+            estado_actual, valor_actual, area, impactos = en_curso
+            seguidor = self.museo.crear_seguidor(estado_actual, factor)
+            # Mismo valor que antes de guardar (el área exacta acumula redondeos)
+            seguidor.area, seguidor.impactos = area, impactos
+            indice = self.museo.crear_indice(estado_actual)
+        else:
+            estado_actual = self.mejor_global.copy()  # se modifica en el sitio
+            seguidor = self.museo.crear_seguidor(estado_actual, factor)
+            indice = self.museo.crear_indice(estado_actual)
+            valor_actual = seguidor.area
+            self.evaluaciones += 1
+            if cache is not None:
+                cache.guardar(cache.clave(estado_actual), valor_actual)
+        if cache is not None:
+            self._clave = cache.clave(estado_actual)  # se actualiza con cada movimiento aceptado
+            self.valor_global = valor_actual
+            if factor == 1:
+                self.historial.append({'tiempo': time.time() - inicio, 'evaluaciones': self.evaluaciones,
+                                       'area': valor_actual})
         
-        while temperatura > 0.1:
+        while temperatura > temp_fin and not self._agotado(inicio):
             iteracion += 1
             
-            self.museo.camaras = estado_actual
-            self.interfaz.actualizar_visualizacion()
-            self.interfaz.actualizar_stats(
-                iteracion=iteracion,
-                area_actual=valor_actual,
-                mejor_area=self.valor_global,
-                algoritmo="Simulated Annealing"
-            )
+            with self.instrumentacion.fase('interfaz'):
+                self.museo.camaras = estado_actual
+                self.museo.solapamientos = seguidor.solapamientos
+                self.interfaz.actualizar_visualizacion()
+                self.interfaz.actualizar_stats(
+                    iteracion=iteracion,
+                    area_actual=valor_actual,
+                    mejor_area=self.valor_global,
+                    algoritmo="Simulated Annealing"
+                )
             
-            vecino = self._vecino_aleatorio(estado_actual)
-            if vecino is None:
-                temperatura *= self.enfriamiento
+            paso = self._paso(estado_actual, valor_actual, seguidor, indice, temperatura, cache)
+            if paso is None:
+                self.telemetria.iteracion(iteracion, valor_actual, self.valor_global, self.evaluaciones,
+                                          None, temperatura)
+                temperatura = self.calendario.actualizar(temperatura, None)
+                self._guardar_punto_control(inicio, temperatura, iteracion,
+                                            estado_actual, valor_actual, seguidor)
                 continue
             
-            valor_vecino = self._evaluar(vecino)
-            delta = valor_vecino - valor_actual
-            
-            if delta > 0 or random.random() < math.exp(delta / temperatura):
-                estado_actual = vecino
-                valor_actual = valor_vecino
-                
-                if valor_actual > self.valor_global:
-                    self.valor_global = valor_actual
-                    self.mejor_global = estado_actual
+            estado_actual, valor_actual, aceptado = paso
+            if aceptado and valor_actual > self.valor_global:
+                self.valor_global = valor_actual
+                self.mejor_global = estado_actual.copy()
+                self.calendario.mejora(temperatura)
+                if factor == 1:
+                    self.historial.append({'tiempo': time.time() - inicio,
+                                           'evaluaciones': self.evaluaciones,
+                                           'area': valor_actual})
             
             if iteracion % 50 == 0:
                 self.interfaz.log(f"❄️ T={temperatura:.2f}, Área={valor_actual:.1f} m²")
+            self.telemetria.iteracion(iteracion, valor_actual, self.valor_global, self.evaluaciones,
+                                      aceptado, temperatura)
             
-            temperatura *= self.enfriamiento
-            self.interfaz.velocidad.sleep()
+            temperatura = self.calendario.actualizar(temperatura, aceptado)
+            self._guardar_punto_control(inicio, temperatura, iteracion,
+                                        estado_actual, valor_actual, seguidor)
+            with self.instrumentacion.fase('espera'):
+                self.interfaz.velocidad.sleep()
+        
+        return temperatura, iteracion
+    
+    def _paso(self, estado, valor, seguidor, indice, temperatura, cache=None):
+        """Un paso de Metropolis sobre ``estado`` (en el sitio): (estado, valor, aceptado) o None si el vecino solapa"""
+        with self.instrumentacion.fase('vecinos'):
+            movimiento = self._movimiento_aleatorio(estado, indice)
+        if movimiento is None:
+            self.instrumentacion.contar('vecinos_infactibles')
+            return None
+        self.instrumentacion.contar('vecinos_factibles')
+        
+        # Solo se recalculan el disco viejo y el nuevo de la cámara movida
+        idx, nueva_pos = movimiento
+        valor_vecino, aplicado = self._probar_movimiento(estado, seguidor, idx, nueva_pos, cache)
+        delta = valor_vecino - valor
+        
+        if delta > 0 or self.rng.random() < math.exp(delta / temperatura):
+            if not aplicado:  # acierto de caché: el seguidor aún no tiene el movimiento
+                seguidor.mover(idx, nueva_pos)
+            seguidor.confirmar()
+            indice.mover(idx, nueva_pos)
+            if cache is not None:
+                self._clave = cache.clave_movimiento(self._clave, estado[idx], nueva_pos)
+            estado[idx] = nueva_pos  # en el sitio: quien guarde el estado debe copiarlo
+            self.instrumentacion.contar('aceptados')
+            return estado, valor_vecino, True
+        
+        if aplicado:
+            seguidor.deshacer()
+        self.instrumentacion.contar('rechazados')
+        return estado, valor, False
+    
+    def _movimiento_aleatorio(self, estado, indice=None):
+        """Perturba una cámara; devuelve (indice, nueva_pos) o None si solapa o cae fuera del plano"""
+        idx = self.rng.randint(0, len(estado) - 1)
+        x, y = estado[idx]
+        
+        dx = self.rng.randint(-self.desplazamiento, self.desplazamiento)
+        dy = self.rng.randint(-self.desplazamiento, self.desplazamiento)
+        nueva_pos = (max(self.museo.radio, min(self.museo.tamano - self.museo.radio, x + dx)),
+                     max(self.museo.radio, min(self.museo.tamano - self.museo.radio, y + dy)))
+        
+        if indice is None:
+            indice = self.museo.crear_indice(estado)
+        if not self.museo.es_valido(nueva_pos) or indice.hay_conflicto(nueva_pos, excepto=idx):
+            return None
+        return idx, nueva_pos
+    
+    def _evaluar_movimiento(self, estado, seguidor, i, nueva_pos, cache=None):
+        """Área del estado con la cámara i en nueva_pos, sin consolidar el movimiento"""
+        area, aplicado = self._probar_movimiento(estado, seguidor, i, nueva_pos, cache)
+        if aplicado:
+            seguidor.deshacer()
+        return area
+    
+    def _probar_movimiento(self, estado, seguidor, i, nueva_pos, cache=None):
+        """(área, aplicado): si no hay acierto de caché el movimiento queda pendiente en el seguidor.
+
+        Quien llama lo confirma o lo deshace, así un movimiento aceptado
+        solo actualiza el seguidor una vez. Con ``cache``, ``self._clave`` es
+        la clave de ``estado``.
+        """
+        self.evaluaciones += 1
+        if cache is not None:
+            clave = cache.clave_movimiento(self._clave, estado[i], nueva_pos)
+            area = cache.obtener(clave)
+            if area is not None:
+                return area, False
+        with self.instrumentacion.fase('evaluacion'):
+            area = seguidor.mover(i, nueva_pos)
+        if cache is not None:
+            cache.guardar(clave, area)
+        return area, True
+
+
+class AgenteTempladoParalelo:
+    """Simulated Annealing multicadena con intercambio de réplicas (parallel tempering)"""
+    def __init__(self, museo, interfaz, semilla=None, cadenas=4, trabajadores=1, telemetria=None):
+        self.museo = museo
+        self.interfaz = interfaz
+        self.semilla = semilla
+        self.telemetria = telemetria if telemetria is not None else TELEMETRIA_NULA
+        self.num_cadenas = cadenas
+        self.trabajadores = trabajadores  # > 1: cadenas en procesos paralelos
+        self.temp_max = 1000
+        self.temp_min = 1
+        self.rondas = 100            # intercambios entre temperaturas vecinas
+        self.pasos_por_ronda = 25    # pasos de Metropolis de cada cadena por ronda
+        self.mejor_global = None
+        self.valor_global = -1
+        self.evaluaciones = 0
+        self.historial = []  # mejoras del mejor global: tiempo, evaluaciones, área
+        self.tiempo_ejecucion = 0
+    
+    def _temperaturas(self):
+        """Escalera geométrica de temp_max (cadena 0) a temp_min"""
+        if self.num_cadenas == 1:
+            return [self.temp_min]
+        razon = (self.temp_min / self.temp_max) ** (1 / (self.num_cadenas - 1))
+        return [self.temp_max * razon**k for k in range(self.num_cadenas)]
+    
+    def buscar(self):
+        """PARALLEL TEMPERING"""
+        self.interfaz.log("="*50)
+        self.interfaz.log(f"🚀 INICIANDO TEMPLADO PARALELO ({self.num_cadenas} cadenas)...")
+        self.telemetria.inicio("Templado Paralelo")
+        inicio = self._inicio = time.time()
+        self.historial = []
+        
+        # Cada cadena lleva su propio generador: el resultado no depende de los procesos
+        maestro = random.Random(self.semilla)
+        cadenas = []
+        for temperatura in self._temperaturas():
+            agente = AgenteSimulatedAnnealing(self.museo, self.interfaz, maestro.getrandbits(64))
+            estado = self.museo.generar_estado_inicial(agente.rng)
+            valor = self.museo.crear_seguidor(estado).area
+            cadenas.append({
+                'temperatura': temperatura,
+                'estado': estado,
+                'valor': valor,
+                'mejor': estado.copy(),
+                'valor_mejor': valor,
+                'rng': agente.rng.getstate(),
+                'propuestos': 0,
+                'aceptados': 0,
+                'intercambios': 0,
+                'evaluaciones': 1
+            })
+        
+        if self.trabajadores > 1:
+            with ProcessPoolExecutor(max_workers=self.trabajadores) as ejecutor:
+                rondas = self._rondas(cadenas, maestro, lambda cs: list(ejecutor.map(
+                    _segmento_cadena, [self.museo] * len(cs), cs, [self.pasos_por_ronda] * len(cs))))
+        else:
+            rondas = self._rondas(cadenas, maestro, lambda cs: [
+                _segmento_cadena(self.museo, c, self.pasos_por_ronda) for c in cs])
         
         self.tiempo_ejecucion = time.time() - inicio
+        self.evaluaciones = sum(c['evaluaciones'] for c in cadenas)
         self.museo.camaras = self.mejor_global
-        self.interfaz.log(f"🏁 FIN SIMULATED ANNEALING - Área: {self.valor_global:.1f} m²")
+        self.interfaz.log(f"🏁 FIN TEMPLADO PARALELO - Área: {self.valor_global:.1f} m²")
         
-        return {
-            'algoritmo': 'Simulated Annealing',
+        resultado = {
+            'algoritmo': 'Templado Paralelo',
             'area': self.valor_global,
             'tiempo': self.tiempo_ejecucion,
-            'iteraciones': iteracion,
-            'solucion': self.mejor_global
+            'iteraciones': rondas * self.pasos_por_ronda,
+            'solucion': list(self.mejor_global),
+            'evaluaciones': self.evaluaciones,
+            'historial': self.historial,
+            'cadenas': [{
+                'temperatura': c['temperatura'],
+                'area': c['valor_mejor'],
+                'aceptacion': c['aceptados'] / max(1, c['propuestos']),
+                'intercambios': c['intercambios']
+            } for c in cadenas]
         }
+        self.telemetria.fin(resultado)
+        return resultado
     
-    def _vecino_aleatorio(self, estado):
-        """Genera vecino perturbando una cámara"""
-        nuevo_estado = estado.copy()
-        idx = random.randint(0, len(estado) - 1)
-        x, y = nuevo_estado[idx]
-        
-        dx = random.randint(-10, 10)
-        dy = random.randint(-10, 10)
-        nueva_pos = (max(self.museo.radio, min(self.museo.tamano - self.museo.radio, x + dx)),
-                     max(self.museo.radio, min(self.museo.tamano - self.museo.radio, y + dy)))
-        
-        nuevo_estado[idx] = nueva_pos
-        
-        for i, pos in enumerate(nuevo_estado):
-            if i != idx and self.museo.hay_solapamiento(pos, nueva_pos):
-                return None
-        return nuevo_estado
+    def _rondas(self, cadenas, rng, avanzar):
+        """Alterna segmentos de Metropolis con intercambios entre temperaturas vecinas.
+
+        Devuelve el número de rondas completadas (menos de ``rondas`` si se detiene).
+        """
+        for ronda in range(self.rondas):
+            cadenas[:] = avanzar(cadenas)
+            
+            for c in cadenas:
+                if c['valor_mejor'] > self.valor_global:
+                    self.valor_global = c['valor_mejor']
+                    self.mejor_global = c['mejor']
+                    self.historial.append({
+                        'tiempo': time.time() - self._inicio,
+                        'evaluaciones': sum(c['evaluaciones'] for c in cadenas),
+                        'area': self.valor_global
+                    })
+            
+            # Pares (0,1),(2,3)... en rondas pares y (1,2),(3,4)... en impares
+            for k in range(ronda % 2, len(cadenas) - 1, 2):
+                a, b = cadenas[k], cadenas[k + 1]
+                exponente = (b['valor'] - a['valor']) * (1 / a['temperatura'] - 1 / b['temperatura'])
+                if exponente >= 0 or rng.random() < math.exp(exponente):
+                    a['estado'], b['estado'] = b['estado'], a['estado']
+                    a['valor'], b['valor'] = b['valor'], a['valor']
+                    a['intercambios'] += 1
+                    b['intercambios'] += 1
+            
+            fria = cadenas[-1]
+            self.museo.camaras = fria['estado']
+            self.interfaz.actualizar_visualizacion()
+            self.interfaz.actualizar_stats(
+                iteracion=ronda + 1,
+                area_actual=fria['valor'],
+                mejor_area=self.valor_global,
+                algoritmo="Templado Paralelo"
+            )
+            if (ronda + 1) % 10 == 0:
+                self.interfaz.log(f"🔥 Ronda {ronda + 1}: áreas {[c['valor'] for c in cadenas]}")
+            self.telemetria.iteracion(ronda + 1, fria['valor'], self.valor_global,
+                                      sum(c['evaluaciones'] for c in cadenas),
+                                      temperatura=fria['temperatura'])
+            if self.telemetria.detenida:
+                self.interfaz.log("⏹️ Búsqueda detenida")
+                return ronda + 1
+            self.interfaz.velocidad.sleep()
+        return self.rondas
+
+
+def _segmento_cadena(museo, cadena, pasos):
+    """Avanza una cadena a temperatura fija (se ejecuta en un proceso trabajador)"""
+    agente = AgenteSimulatedAnnealing(museo, InterfazNula())
+    agente.rng.setstate(cadena['rng'])
+    estado, valor = cadena['estado'], cadena['valor']
+    seguidor = museo.crear_seguidor(estado)
+    indice = museo.crear_indice(estado)
     
-    def _generar_estado_aleatorio(self):
-        """Genera estado inicial válido"""
-        camaras = []
-        intentos = 0
-        while len(camaras) < self.museo.num_camaras and intentos < 500:
-            x = random.randint(self.museo.radio, self.museo.tamano - self.museo.radio)
-            y = random.randint(self.museo.radio, self.museo.tamano - self.museo.radio)
-            posicion = (x, y)
-            if all(not self.museo.hay_solapamiento(posicion, c) for c in camaras):
-                camaras.append(posicion)
-            intentos += 1
-        return camaras
+    for _ in range(pasos):
+        cadena['propuestos'] += 1
+        paso = agente._paso(estado, valor, seguidor, indice, cadena['temperatura'])
+        if paso is None:
+            continue
+        estado, valor, aceptado = paso
+        if aceptado:
+            cadena['aceptados'] += 1
+            if valor > cadena['valor_mejor']:
+                cadena['valor_mejor'] = valor
+                cadena['mejor'] = estado.copy()
     
-    def _evaluar(self, estado):
-        """Función objetivo"""
-        temp = self.museo.camaras
-        self.museo.camaras = estado
-        area = self.museo.calcular_area_cubierta()
-        self.museo.camaras = temp
-        return area
+    cadena['estado'], cadena['valor'] = estado, valor
+    cadena['rng'] = agente.rng.getstate()
+    cadena['evaluaciones'] += agente.evaluaciones
+    return cadena
 
 
 class AgenteSecuencial:
     """Orquesta ambos algoritmos y muestra tabla comparativa"""
-    def __init__(self, museo, interfaz):
+    def __init__(self, museo, interfaz, telemetria=None, cache=None):
         self.museo = museo
         self.interfaz = interfaz
+        self.telemetria = telemetria
+        self.cache = cache  # CacheEvaluacion opcional: mismo museo, ambos agentes la comparten
         self.resultados = []
         
     def ejecutar_todos(self):
@@ -211,7 +891,8 @@ class AgenteSecuencial:
         # Ejecutar Hill Climbing
         self.interfaz.log("\n📌 ALGORITMO 1 DE 2: HILL CLIMBING")
         self.interfaz.log("="*50)
-        agente_hc = AgenteHillClimbing(self.museo, self.interfaz)
+        agente_hc = AgenteHillClimbing(self.museo, self.interfaz, cache=self.cache,
+                                       telemetria=self.telemetria)
         resultado_hc = agente_hc.buscar()
         self.resultados.append(resultado_hc)
         
@@ -223,7 +904,8 @@ class AgenteSecuencial:
         # Ejecutar Simulated Annealing
         self.interfaz.log("\n📌 ALGORITMO 2 DE 2: SIMULATED ANNEALING")
         self.interfaz.log("="*50)
-        agente_sa = AgenteSimulatedAnnealing(self.museo, self.interfaz)
+        agente_sa = AgenteSimulatedAnnealing(self.museo, self.interfaz, cache=self.cache,
+                                             telemetria=self.telemetria)
         resultado_sa = agente_sa.buscar()
         self.resultados.append(resultado_sa)
         
@@ -254,4 +936,201 @@ class AgenteSecuencial:
         self.interfaz.log(f"🏆 GANADOR: {ganador['algoritmo']}")
         self.interfaz.log(f"📈 Área máxima: {ganador['area']:.1f} m²")
         self.interfaz.log(f"📊 Mejora relativa: {mejora:.1f}%")
-        self.interfaz.log("═"*60)
\ No newline at end of file
+        self.interfaz.log("═"*60)
+
+
+class InterfazNula:
+    """Interfaz sin pantalla: visualización y log no hacen nada"""
+    def __init__(self):
+        self.velocidad = VelocidadNula()
+    
+    def log(self, mensaje):
+        pass
+    
+    def actualizar_visualizacion(self):
+        pass
+    
+    def actualizar_stats(self, iteracion, area_actual, mejor_area, algoritmo):
+        pass
+
+
+class InterfazRegistro(InterfazNula):
+    """Interfaz sin pantalla que guarda el log y las últimas estadísticas"""
+    def __init__(self, salida=None):
+        super().__init__()
+        self.salida = salida
+        self.mensajes = []
+        self.stats = None
+    
+    def log(self, mensaje):
+        self.mensajes.append(mensaje)
+        if self.salida is not None:
+            print(mensaje, file=self.salida)
+    
+    def actualizar_stats(self, iteracion, area_actual, mejor_area, algoritmo):
+        self.stats = {
+            'iteracion': iteracion,
+            'area_actual': area_actual,
+            'mejor_area': mejor_area,
+            'algoritmo': algoritmo
+        }
+
+
+AGENTES = {
+    'hc': AgenteHillClimbing,
+    'sa': AgenteSimulatedAnnealing,
+    'pt': AgenteTempladoParalelo,
+}
+
+
+def crear_parser():
+    """Opciones de la ejecución sin interfaz (también las usa servidor.py)"""
+    parser = argparse.ArgumentParser(
+        prog="python -m agentes",
+        description="Ejecuta un agente de búsqueda sin interfaz gráfica"
+    )
+    parser.add_argument("--algo", choices=sorted(AGENTES), default="hc",
+                        help="algoritmo de búsqueda")
+    parser.add_argument("--cameras", type=int, default=10, help="número de cámaras")
+    parser.add_argument("--size", type=int, default=120, help="lado del museo (m)")
+    parser.add_argument("--radius", type=int, default=15, help="radio de cobertura (m)")
+    parser.add_argument("--seed", type=int, default=None, help="semilla aleatoria")
+    parser.add_argument("--backend", default="auto", help="backend de cobertura")
+    parser.add_argument("--init", choices=sorted(INICIALIZADORES), default="poisson",
+                        help="estrategia del estado inicial")
+    parser.add_argument("--schedule", type=_leer_resoluciones, default=None,
+                        metavar="FACTOR:PASO,...",
+                        help="(hc/sa) calendario de grueso a fino, p. ej. 4:20,2:10,1:5")
+    parser.add_argument("--plan", metavar="FICHERO", default=None,
+                        help="plano de planta JSON/GeoJSON (sustituye a --size)")
+    parser.add_argument("--vision", action="store_true",
+                        help="con --plan, los muros y obstáculos tapan la visión")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos para los reinicios (hc) o las cadenas (pt)")
+    parser.add_argument("--chains", type=int, default=4,
+                        help="cadenas del templado paralelo (pt)")
+    parser.add_argument("--cache", type=int, default=0,
+                        help="capacidad de la caché LRU de evaluaciones (0: sin caché)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="añade contadores y tiempos por fase al resultado (hc, sa)")
+    parser.add_argument("--profile", metavar="FICHERO", default=None,
+                        help="guarda un perfil cProfile/pstats de la búsqueda")
+    parser.add_argument("--cooling", choices=sorted(ENFRIAMIENTOS), default="geometrico",
+                        help="(sa) calendario de enfriamiento")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="(sa) calibra T0 y Tf con deltas de movimientos muestreados")
+    parser.add_argument("--reheat", type=int, default=None, metavar="N",
+                        help="(sa) recalienta tras N iteraciones sin mejorar el mejor global")
+    parser.add_argument("--time-budget", type=float, default=None, metavar="S",
+                        help="(sa) límite de tiempo de la búsqueda en segundos")
+    parser.add_argument("--eval-budget", type=int, default=None, metavar="N",
+                        help="(sa) límite de evaluaciones de la búsqueda")
+    parser.add_argument("--events", metavar="FICHERO", default=None,
+                        help="escribe eventos de progreso en JSON Lines ('-' para stderr)")
+    parser.add_argument("--events-interval", type=float, default=0.1, metavar="S",
+                        help="segundos entre eventos de progreso")
+    parser.add_argument("--target", type=float, default=None, metavar="AREA",
+                        help="detiene la búsqueda al alcanzar esta área (m²)")
+    parser.add_argument("--min-cameras", type=float, default=None, metavar="FRACCION",
+                        help="(hc/sa) busca el menor número de cámaras que cubre esta "
+                             "fracción del suelo (sustituye a --cameras)")
+    parser.add_argument("--max-cameras", type=int, default=None, metavar="N",
+                        help="con --min-cameras, número máximo de cámaras a probar")
+    parser.add_argument("--patience", type=int, default=2000, metavar="N",
+                        help="con --min-cameras, corta cada búsqueda tras N evaluaciones sin mejorar")
+    parser.add_argument("--checkpoint", metavar="FICHERO", default=None,
+                        help="(hc/sa) guarda periódicamente el estado de la búsqueda")
+    parser.add_argument("--checkpoint-every", type=int, default=None, metavar="N",
+                        help="iteraciones entre puntos de control (por defecto 1000)")
+    parser.add_argument("--checkpoint-seconds", type=float, default=None, metavar="S",
+                        help="segundos entre puntos de control")
+    parser.add_argument("--resume", action="store_true",
+                        help="con --checkpoint, continúa desde el último punto de control")
+    parser.add_argument("--verbose", action="store_true",
+                        help="muestra el log del agente en stderr")
+    return parser
+
+
+def validar_opciones(args):
+    """Comprueba las combinaciones de opciones; ValueError si no son válidas (también servidor.py)"""
+    if args.resume and not args.checkpoint:
+        raise ValueError("--resume necesita --checkpoint")
+    if args.min_cameras is not None:
+        if args.algo == 'pt' or args.checkpoint:
+            raise ValueError("--min-cameras solo admite hc y sa, sin --checkpoint")
+        if not 0 < args.min_cameras <= 1:
+            raise ValueError("--min-cameras debe estar en (0, 1]")
+
+
+def crear_agente(args, interfaz, telemetria=None):
+    """Museo y agente configurados según las opciones ya analizadas"""
+    if isinstance(args.plan, dict):  # contenido del plano (trabajos del servidor)
+        plano = plano_desde_json(args.plan)
+    else:
+        plano = cargar_plano(args.plan) if args.plan else None
+    museo = Museo(tamano=args.size, num_camaras=args.cameras,
+                  radio_cobertura=args.radius, cobertura=args.backend,
+                  inicializacion=args.init, plano=plano, vision=args.vision)
+    opciones = {'semilla': args.seed}
+    if args.cache > 0 and args.algo in ('hc', 'sa'):
+        opciones['cache'] = CacheEvaluacion(args.cache)
+    if args.instrument and args.algo in ('hc', 'sa'):
+        opciones['instrumentacion'] = Instrumentacion()
+    if args.schedule and args.algo in ('hc', 'sa'):
+        opciones['resoluciones'] = args.schedule
+    if args.checkpoint and args.algo in ('hc', 'sa'):
+        opciones['punto_control'] = PuntoControl(args.checkpoint, args.checkpoint_every,
+                                                 args.checkpoint_seconds)
+        opciones['reanudar'] = args.resume
+    if args.algo == 'sa':
+        opciones['calendario'] = crear_enfriamiento(args.cooling, paciencia=args.reheat)
+        opciones['calibrar'] = args.calibrate
+        opciones['presupuesto_tiempo'] = args.time_budget
+        opciones['presupuesto_evaluaciones'] = args.eval_budget
+    if args.algo in ('hc', 'pt'):
+        opciones['trabajadores'] = args.workers
+    if args.algo == 'pt':
+        opciones['cadenas'] = args.chains
+    if args.min_cameras is not None:
+        semilla = opciones.pop('semilla')
+        return MinimizadorCamaras(museo, interfaz, args.min_cameras, AGENTES[args.algo], opciones,
+                                  maximo=args.max_cameras, paciencia=args.patience,
+                                  semilla=semilla, telemetria=telemetria)
+    if telemetria is not None:
+        opciones['telemetria'] = telemetria
+    return AGENTES[args.algo](museo, interfaz, **opciones)
+
+
+def main(argv=None):
+    """Ejecución sin interfaz gráfica: imprime el resultado como JSON"""
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    try:
+        validar_opciones(args)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    interfaz = InterfazRegistro(sys.stderr if args.verbose else None)
+    telemetria = escritor = None
+    if args.events or args.target is not None:
+        telemetria = Telemetria(intervalo=args.events_interval, objetivo=args.target)
+        if args.events:
+            # Sumidero sin pérdidas: la búsqueda espera si el fichero no da abasto
+            suscripcion = telemetria.suscribir(bloquear=True)
+            escritor = threading.Thread(target=volcar_jsonl, daemon=True,
+                                        args=(suscripcion, args.events))
+            escritor.start()
+    try:
+        agente = crear_agente(args, interfaz, telemetria)
+        resultado = perfilar(agente.buscar, args.profile) if args.profile else agente.buscar()
+    finally:
+        if escritor is not None:
+            suscripcion.cerrar()  # si la búsqueda falla no llega 'fin': el volcado termina igual
+            escritor.join()
+    
+    print(json.dumps(resultado, ensure_ascii=False))
+    return resultado
+
+
+if __name__ == "__main__":
+    main()
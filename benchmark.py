@@ -0,0 +1,158 @@
+# benchmark.py - Banco de pruebas reproducible de algoritmos y backends
+import argparse
+import csv
+import itertools
+import json
+import math
+import statistics
+import sys
+import time
+from agentes import AGENTES, InterfazNula
+from inicializacion import INICIALIZADORES
+from modelo import Museo
+
+CAMPOS = ['algo', 'inicializacion', 'backend', 'tamano', 'camaras', 'radio', 'semilla',
+          'tiempo', 'area', 'evaluaciones', 'eval_por_segundo', 'objetivo', 'tiempo_objetivo']
+METRICAS = ['tiempo', 'eval_por_segundo', 'area', 'tiempo_objetivo']
+
+
+def ejecutar_caso(algo, inicializacion, backend, tamano, camaras, radio, semilla):
+    """Ejecuta un agente sin interfaz y devuelve la fila de resultados"""
+    museo = Museo(tamano=tamano, num_camaras=camaras, radio_cobertura=radio, cobertura=backend,
+                  inicializacion=inicializacion)
+    inicio = time.perf_counter()
+    resultado = AGENTES[algo](museo, InterfazNula(), semilla=semilla).buscar()
+    tiempo = time.perf_counter() - inicio
+
+    return {
+        'algo': algo,
+        'inicializacion': inicializacion,
+        'backend': backend,
+        'tamano': tamano,
+        'camaras': camaras,
+        'radio': radio,
+        'semilla': semilla,
+        'tiempo': tiempo,
+        'area': resultado['area'],
+        'evaluaciones': resultado['evaluaciones'],
+        'eval_por_segundo': resultado['evaluaciones'] / tiempo if tiempo > 0 else 0.0,
+        'historial': resultado['historial']
+    }
+
+
+def asignar_objetivos(filas, fraccion):
+    """Tiempo hasta alcanzar ``fraccion`` del mejor área conocida de cada instancia.
+
+    El objetivo se fija por (backend, tamaño, cámaras, radio) con el mejor
+    resultado de todos los algoritmos y semillas; None si nunca se alcanza.
+    """
+    instancia = lambda f: (f['backend'], f['tamano'], f['camaras'], f['radio'])
+    mejores = {}
+    for f in filas:
+        mejores[instancia(f)] = max(mejores.get(instancia(f), f['area']), f['area'])
+
+    for f in filas:
+        f['objetivo'] = fraccion * mejores[instancia(f)]
+        f['tiempo_objetivo'] = next(
+            (h['tiempo'] for h in f['historial'] if h['area'] >= f['objetivo']), None)
+
+
+def percentil(valores, p):
+    """Percentil con interpolación lineal (valores ya ordenados)"""
+    if len(valores) == 1:
+        return valores[0]
+    pos = (len(valores) - 1) * p / 100
+    bajo = math.floor(pos)
+    alto = min(bajo + 1, len(valores) - 1)
+    return valores[bajo] + (valores[alto] - valores[bajo]) * (pos - bajo)
+
+
+def resumir(filas):
+    """Media, mediana y p95 de cada métrica por algoritmo e instancia"""
+    grupos = {}
+    for f in filas:
+        clave = (f['algo'], f['inicializacion'], f['backend'], f['tamano'], f['camaras'], f['radio'])
+        grupos.setdefault(clave, []).append(f)
+
+    resumen = []
+    for (algo, inicializacion, backend, tamano, camaras, radio), grupo in grupos.items():
+        fila = {'algo': algo, 'inicializacion': inicializacion, 'backend': backend, 'tamano': tamano,
+                'camaras': camaras, 'radio': radio, 'ejecuciones': len(grupo),
+                'alcanzan_objetivo': sum(f['tiempo_objetivo'] is not None for f in grupo)}
+        for metrica in METRICAS:
+            valores = sorted(f[metrica] for f in grupo if f[metrica] is not None)
+            if valores:
+                fila[metrica] = {'media': statistics.fmean(valores),
+                                 'mediana': statistics.median(valores),
+                                 'p95': percentil(valores, 95)}
+            else:
+                fila[metrica] = None
+        resumen.append(fila)
+    return resumen
+
+
+def imprimir_resumen(resumen, salida=sys.stdout):
+    """Tabla de resumen (mediana y p95) en texto"""
+    def celda(stats, formato):
+        if stats is None:
+            return "-"
+        return f"{stats['mediana']:{formato}}/{stats['p95']:{formato}}"
+
+    print(f"{'Algo':<5} {'Inicio':<10} {'Backend':<9} {'Tamaño':>6} {'Cám':>4} {'Radio':>5} "
+          f"{'Tiempo s (med/p95)':>20} {'Eval/s (med/p95)':>20} {'Área (med/p95)':>18} "
+          f"{'T objetivo (med/p95)':>22} {'Alcanzan':>8}", file=salida)
+    print("─"*151, file=salida)
+    for f in resumen:
+        print(f"{f['algo']:<5} {f['inicializacion']:<10} {f['backend']:<9} {f['tamano']:>6} {f['camaras']:>4} {f['radio']:>5} "
+              f"{celda(f['tiempo'], '.3f'):>20} {celda(f['eval_por_segundo'], '.0f'):>20} "
+              f"{celda(f['area'], '.0f'):>18} {celda(f['tiempo_objetivo'], '.3f'):>22} "
+              f"{f['alcanzan_objetivo']:>4}/{f['ejecuciones']:<3}", file=salida)
+
+
+def guardar(filas, resumen, prefijo):
+    """Escribe <prefijo>.csv (una fila por ejecución) y <prefijo>.json (todo)"""
+    with open(f"{prefijo}.csv", "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=CAMPOS, extrasaction="ignore")
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+    with open(f"{prefijo}.json", "w", encoding="utf-8") as f:
+        json.dump({'ejecuciones': filas, 'resumen': resumen}, f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python benchmark.py",
+        description="Compara algoritmos y backends de cobertura en varios tamaños de problema"
+    )
+    parser.add_argument("--algos", nargs="+", choices=sorted(AGENTES), default=["hc", "sa"])
+    parser.add_argument("--inits", nargs="+", choices=sorted(INICIALIZADORES), default=["poisson"])
+    parser.add_argument("--backends", nargs="+", default=["numpy"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[120])
+    parser.add_argument("--cameras", nargs="+", type=int, default=[10])
+    parser.add_argument("--radius", nargs="+", type=int, default=[15])
+    parser.add_argument("--seeds", nargs="+", type=int, default=list(range(5)))
+    parser.add_argument("--target", type=float, default=0.95,
+                        help="fracción del mejor área conocida usada como objetivo")
+    parser.add_argument("--out", default=None,
+                        help="prefijo de los ficheros CSV/JSON de salida")
+    args = parser.parse_args(argv)
+
+    casos = list(itertools.product(args.algos, args.inits, args.backends, args.sizes,
+                                   args.cameras, args.radius, args.seeds))
+    filas = []
+    for n, caso in enumerate(casos, 1):
+        print(f"[{n}/{len(casos)}] algo={caso[0]} inicializacion={caso[1]} backend={caso[2]} "
+              f"tamano={caso[3]} camaras={caso[4]} radio={caso[5]} semilla={caso[6]}", file=sys.stderr)
+        filas.append(ejecutar_caso(*caso))
+
+    asignar_objetivos(filas, args.target)
+    resumen = resumir(filas)
+    imprimir_resumen(resumen)
+    if args.out:
+        guardar(filas, resumen, args.out)
+    return filas, resumen
+
+
+if __name__ == "__main__":
+    main()
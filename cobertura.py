@@ -0,0 +1,556 @@
+# cobertura.py - Backends de cálculo del área cubierta
+import math
+from collections import OrderedDict
+from estado import EstadoCamaras
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él se usa el backend de conjuntos
+    np = None
+
+
+class CoberturaConjunto:
+    """Backend de referencia: conjunto de puntos (implementación original).
+
+    Con plano, los puntos de cada posición (disco ∩ plano ∩ visibilidad) se
+    memorizan en una caché LRU de ``capacidad_huellas`` posiciones.
+    """
+    nombre = "conjunto"
+    capacidad_huellas = 1024
+
+    def __init__(self, tamano, radio, plano=None, vision=False):
+        self.tamano = tamano
+        self.radio = radio
+        self.plano = plano
+        self.vision = vision and plano is not None
+        self._huellas = OrderedDict()
+
+    def calcular(self, camaras):
+        """Devuelve (puntos cubiertos, solapamientos)"""
+        puntos_cubiertos = set()
+        solapamientos = 0
+
+        for camara in camaras:
+            for punto in self.puntos(camara):
+                if punto in puntos_cubiertos:
+                    solapamientos += 1
+                puntos_cubiertos.add(punto)
+
+        return len(puntos_cubiertos), solapamientos
+
+    def puntos(self, posicion):
+        """Puntos de la rejilla dentro del disco de una cámara (y del plano, si hay)"""
+        if self.plano is None:
+            return self._puntos(posicion)
+        huella = self._huellas.get(posicion)
+        if huella is None:
+            huella = self._huellas[posicion] = tuple(self._puntos(posicion))
+            if len(self._huellas) > self.capacidad_huellas:
+                self._huellas.popitem(last=False)
+        else:
+            self._huellas.move_to_end(posicion)
+        return huella
+
+    def _puntos(self, posicion):
+        x, y = posicion
+        if self.vision:  # los segmentos no salen de la caja del disco
+            muros = self.plano.muros_en(x - self.radio, y - self.radio, x + self.radio, y + self.radio)
+        for i in range(max(0, int(x - self.radio)), min(self.tamano, int(x + self.radio)) + 1):
+            for j in range(max(0, int(y - self.radio)), min(self.tamano, int(y + self.radio)) + 1):
+                if math.sqrt((i - x)**2 + (j - y)**2) <= self.radio:
+                    if self.plano is not None and not self.plano.valida(i, j):
+                        continue
+                    if self.vision and not self.plano.visible(posicion, (i, j), muros):
+                        continue
+                    yield (i, j)
+
+    def nueva_rejilla(self):
+        return {}
+
+    def sumar(self, rejilla, posicion):
+        """Añade un disco; devuelve (celdas nuevas, impactos)"""
+        nuevas = impactos = 0
+        for punto in self.puntos(posicion):
+            conteo = rejilla.get(punto, 0)
+            if conteo == 0:
+                nuevas += 1
+            rejilla[punto] = conteo + 1
+            impactos += 1
+        return nuevas, impactos
+
+    def restar(self, rejilla, posicion):
+        """Quita un disco; devuelve (celdas perdidas, impactos)"""
+        perdidas = impactos = 0
+        for punto in self.puntos(posicion):
+            conteo = rejilla[punto] - 1
+            if conteo == 0:
+                del rejilla[punto]
+                perdidas += 1
+            else:
+                rejilla[punto] = conteo
+            impactos += 1
+        return perdidas, impactos
+
+
+class CoberturaNumpy:
+    """Estampa un disco precalculado sobre una rejilla de conteo.
+
+    Con plano, la huella de cada posición (disco ∩ máscara de validez ∩
+    visibilidad) se calcula la primera vez y queda en una caché LRU de
+    ``capacidad_huellas`` posiciones.
+    """
+    nombre = "numpy"
+    capacidad_huellas = 4096
+
+    def __init__(self, tamano, radio, plano=None, vision=False):
+        if np is None:
+            raise ImportError("El backend 'numpy' requiere tener numpy instalado")
+        self.tamano = tamano
+        self.radio = radio
+        self.plano = plano
+        self.vision = vision and plano is not None
+        self._plantillas = {}
+        self._huellas = OrderedDict()
+        self._celdas = {}
+        self._propias = {}
+        self._validas = None
+
+    def _plantilla(self, fx, fy):
+        """Disco booleano para un centro con parte fraccionaria (fx, fy)"""
+        clave = (fx, fy)
+        if clave not in self._plantillas:
+            ki = np.arange(math.floor(fx - self.radio), math.ceil(fx + self.radio) + 1)
+            kj = np.arange(math.floor(fy - self.radio), math.ceil(fy + self.radio) + 1)
+            dist = np.sqrt((ki[:, None] - fx)**2 + (kj[None, :] - fy)**2)
+            self._plantillas[clave] = (int(ki[0]), int(kj[0]), dist <= self.radio)
+        return self._plantillas[clave]
+
+    def _celdas_plantilla(self, fx, fy):
+        """Desplazamientos (dx, dy) desde floor(centro) de las celdas del disco, sus límites
+        y su desplazamiento en la rejilla aplanada"""
+        clave = (fx, fy)
+        if clave not in self._celdas:
+            k0, l0, mascara = self._plantilla(fx, fy)
+            ks, ls = np.nonzero(mascara)
+            ox, oy = ks + k0, ls + l0
+            self._celdas[clave] = (ox, oy, (int(ox.min()), int(ox.max()), int(oy.min()), int(oy.max())),
+                                   ox * (self.tamano + 1) + oy)
+        return self._celdas[clave]
+
+    def _propia(self, fx, fy, dx, dy):
+        """¿Cada celda del disco desplazado (dx, dy) pertenecía al disco sin desplazar?"""
+        clave = (fx, fy, dx, dy)
+        if clave not in self._propias:
+            ox, oy, _, _ = self._celdas_plantilla(fx, fy)
+            k0, l0, mascara = self._plantilla(fx, fy)
+            u, v = ox + dx - k0, oy + dy - l0
+            dentro = (u >= 0) & (u < mascara.shape[0]) & (v >= 0) & (v < mascara.shape[1])
+            propia = np.zeros(len(ox), dtype=bool)
+            propia[dentro] = mascara[u[dentro], v[dentro]]
+            self._propias[clave] = propia
+        return self._propias[clave]
+
+    def _contar(self, plana, bx, by, plantilla, objetivo):
+        """Por cada disco (centro entero bx, by) cuántas celdas válidas tienen conteo ``objetivo``.
+
+        ``objetivo`` es un escalar o una fila por disco con un valor por celda.
+
+        Los discos que caben enteros en la rejilla se leen con índices planos
+        sin comprobar límites; solo los del borde se recortan.
+        """
+        ox, oy, (x_min, x_max, y_min, y_max), desplazamientos = plantilla
+        lado = self.tamano + 1
+        validas = self._validas_planas()
+        resultado = np.empty(len(bx), dtype=np.int64)
+        interior = (bx + x_min >= 0) & (bx + x_max < lado) & (by + y_min >= 0) & (by + y_max < lado)
+        if interior.any():
+            celdas = (bx[interior] * lado + by[interior])[:, None] + desplazamientos[None, :]
+            coincide = plana[celdas] == (objetivo[interior] if np.ndim(objetivo) else objetivo)
+            if validas is not None:
+                coincide &= validas[celdas]
+            resultado[interior] = np.count_nonzero(coincide, axis=1)
+        borde = ~interior
+        if borde.any():
+            x = bx[borde][:, None] + ox[None, :]
+            y = by[borde][:, None] + oy[None, :]
+            celdas = np.clip(x, 0, lado - 1) * lado + np.clip(y, 0, lado - 1)
+            coincide = ((x >= 0) & (x < lado) & (y >= 0) & (y < lado) &
+                        (plana[celdas] == (objetivo[borde] if np.ndim(objetivo) else objetivo)))
+            if validas is not None:
+                coincide &= validas[celdas]
+            resultado[borde] = np.count_nonzero(coincide, axis=1)
+        return resultado
+
+    def _validas_planas(self):
+        if self.plano is None:
+            return None
+        if self._validas is None:
+            lado = self.tamano + 1
+            self._validas = self.plano.validas_numpy()[:lado, :lado].ravel()
+        return self._validas
+
+    def ganancias_movimientos(self, rejilla, camaras, indices, dx, dy):
+        """Cambio de área de cada movimiento (i, dx, dy), vectorizado por lotes.
+
+        Ganancia = celdas del disco nuevo que no cubre ninguna otra cámara
+        (conteo 0, o 1 si la cubría el propio disco viejo) menos celdas que
+        solo cubría el disco viejo (conteo 1). Como la huella solo se
+        desplaza, exige desplazamientos enteros y no usar visión; si no,
+        devuelve None. Hay una pasada por plantilla de disco (parte
+        fraccionaria de las cámaras) y dirección de movimiento.
+        """
+        dx, dy = np.asarray(dx, dtype=float), np.asarray(dy, dtype=float)
+        if self.vision or (dx % 1).any() or (dy % 1).any():
+            return None
+        posiciones = np.asarray(camaras, dtype=float)
+        base = np.floor(posiciones).astype(np.int64)
+        fracciones = [tuple(f) for f in (posiciones - base).tolist()]
+        indices = np.asarray(indices, dtype=np.int64)
+        dx, dy = dx.astype(np.int64), dy.astype(np.int64)
+        plana = rejilla.ravel()
+        perdidas = np.zeros(len(fracciones), dtype=np.int64)
+        ganancias = np.zeros(len(indices), dtype=np.int64)
+
+        for fx, fy in set(fracciones):
+            plantilla = self._celdas_plantilla(fx, fy)
+            grupo = np.array([i for i, f in enumerate(fracciones) if f == (fx, fy)])
+            perdidas[grupo] = self._contar(plana, base[grupo, 0], base[grupo, 1], plantilla, 1)
+            movs = np.nonzero(np.isin(indices, grupo))[0]
+            if len(movs) == 0:
+                continue
+            i, mx, my = indices[movs], dx[movs], dy[movs]
+            # Una fila por movimiento: qué celdas del disco nuevo ya cubría el viejo
+            direcciones = {}
+            fila = [direcciones.setdefault(d, len(direcciones)) for d in zip(mx.tolist(), my.tolist())]
+            propias = np.stack([self._propia(fx, fy, *d) for d in direcciones])[fila]
+            nuevas = self._contar(plana, base[i, 0] + mx, base[i, 1] + my, plantilla, propias)
+            ganancias[movs] = nuevas - perdidas[i]
+        return ganancias
+
+    def huella(self, posicion):
+        """Ventana de la rejilla y máscara del disco recortado al museo"""
+        if self.plano is None:
+            return self._huella_disco(posicion)
+        huella = self._huellas.get(posicion)
+        if huella is not None:
+            self._huellas.move_to_end(posicion)
+            return huella
+        fi, fj, mascara = self._huella_disco(posicion)
+        mascara = mascara & self.plano.validas_numpy()[fi, fj]
+        if self.vision:
+            ii, jj = np.nonzero(mascara)
+            ocultos = ~self.plano.visibles(posicion, ii + fi.start, jj + fj.start)
+            mascara[ii[ocultos], jj[ocultos]] = False
+        huella = self._huellas[posicion] = (fi, fj, mascara)
+        if len(self._huellas) > self.capacidad_huellas:
+            self._huellas.popitem(last=False)
+        return huella
+
+    def _huella_disco(self, posicion):
+        x, y = posicion
+        bx, by = math.floor(x), math.floor(y)
+        k0, l0, mascara = self._plantilla(x - bx, y - by)
+
+        i0, j0 = bx + k0, by + l0
+        i1, j1 = i0 + mascara.shape[0], j0 + mascara.shape[1]
+        ci0, cj0 = max(i0, 0), max(j0, 0)
+        ci1, cj1 = min(i1, self.tamano + 1), min(j1, self.tamano + 1)
+        if ci0 >= ci1 or cj0 >= cj1:
+            return slice(0, 0), slice(0, 0), mascara[:0, :0]
+
+        recorte = mascara[ci0 - i0:ci1 - i0, cj0 - j0:cj1 - j0]
+        return slice(ci0, ci1), slice(cj0, cj1), recorte
+
+    def nueva_rejilla(self):
+        return np.zeros((self.tamano + 1, self.tamano + 1), dtype=np.int32)
+
+    def sumar(self, rejilla, posicion):
+        """Añade un disco; devuelve (celdas nuevas, impactos)"""
+        fi, fj, mascara = self.huella(posicion)
+        ventana = rejilla[fi, fj]
+        nuevas = int(np.count_nonzero(ventana[mascara] == 0))
+        ventana += mascara
+        return nuevas, int(np.count_nonzero(mascara))
+
+    def restar(self, rejilla, posicion):
+        """Quita un disco; devuelve (celdas perdidas, impactos)"""
+        fi, fj, mascara = self.huella(posicion)
+        ventana = rejilla[fi, fj]
+        ventana -= mascara
+        perdidas = int(np.count_nonzero(ventana[mascara] == 0))
+        return perdidas, int(np.count_nonzero(mascara))
+
+    def calcular(self, camaras):
+        """Devuelve (puntos cubiertos, solapamientos)"""
+        rejilla = self.nueva_rejilla()
+        impactos = 0
+        for camara in camaras:
+            fi, fj, mascara = self.huella(camara)
+            rejilla[fi, fj] += mascara
+            impactos += int(np.count_nonzero(mascara))
+
+        cubiertos = int(np.count_nonzero(rejilla))
+        return cubiertos, impactos - cubiertos
+
+
+def area_disco_rectangulo(cx, cy, radio, x0, y0, x1, y1):
+    """Área exacta del disco de centro (cx, cy) recortado al rectángulo [x0,x1]×[y0,y1].
+
+    Integra en x la longitud de la cuerda vertical recortada a [y0, y1]; entre
+    los puntos donde la circunferencia corta y = y0 o y = y1 cada extremo es
+    constante o un arco, ambos con primitiva cerrada.
+    """
+    a0, a1 = max(x0 - cx, -radio), min(x1 - cx, radio)
+    b0, b1 = y0 - cy, y1 - cy
+    if a0 >= a1 or b0 >= b1:
+        return 0.0
+
+    def primitiva(x):  # ∫ sqrt(r² - x²) dx
+        x = max(-radio, min(radio, x))
+        return 0.5 * (x * math.sqrt(radio**2 - x**2) + radio**2 * math.asin(x / radio))
+
+    cortes = {a0, a1}
+    for b in (b0, b1):
+        if abs(b) < radio:
+            s = math.sqrt(radio**2 - b**2)
+            cortes.update(c for c in (-s, s) if a0 < c < a1)
+    cortes = sorted(cortes)
+
+    area = 0.0
+    for u, v in zip(cortes, cortes[1:]):
+        medio = (u + v) / 2
+        h = math.sqrt(radio**2 - medio**2)
+        if min(b1, h) <= max(b0, -h):
+            continue
+        arco = primitiva(v) - primitiva(u)
+        area += b1 * (v - u) if b1 < h else arco
+        area -= b0 * (v - u) if b0 > -h else -arco
+    return area
+
+
+class CoberturaExacta:
+    """Área continua: suma de discos recortados al museo, O(1) por cámara.
+
+    Supone que los discos no se solapan (lo garantiza la restricción de
+    ``hay_solapamiento``), por lo que no hay muestreo de rejilla y los
+    solapamientos son siempre 0.
+    """
+    nombre = "exacto"
+
+    def __init__(self, tamano, radio, plano=None, vision=False):
+        if plano is not None:
+            raise ValueError("El backend 'exacto' no admite planos; usa 'numpy' o 'conjunto'")
+        self.tamano = tamano
+        self.radio = radio
+
+    def area(self, posicion):
+        x, y = posicion
+        return area_disco_rectangulo(x, y, self.radio, 0, 0, self.tamano, self.tamano)
+
+    def calcular(self, camaras):
+        """Devuelve (área cubierta, solapamientos)"""
+        return sum(self.area(camara) for camara in camaras), 0
+
+    def nueva_rejilla(self):
+        return None
+
+    def sumar(self, rejilla, posicion):
+        area = self.area(posicion)
+        return area, area
+
+    def restar(self, rejilla, posicion):
+        area = self.area(posicion)
+        return area, area
+
+
+class CoberturaReducida:
+    """Evalúa con otro backend sobre una rejilla submuestreada de paso ``factor``.
+
+    Recibe posiciones a resolución completa, las divide por ``factor`` y
+    multiplica los conteos por ``factor``² para que las áreas sigan en m²
+    (aproximadas). El backend interno trabaja con ``tamano // factor`` y
+    ``radio / factor``.
+    """
+    def __init__(self, backend, factor):
+        self.backend = backend
+        self.factor = factor
+        self.nombre = backend.nombre
+
+    def _reducir(self, posicion):
+        return (posicion[0] / self.factor, posicion[1] / self.factor)
+
+    def calcular(self, camaras):
+        cubiertos, solapamientos = self.backend.calcular([self._reducir(c) for c in camaras])
+        return cubiertos * self.factor**2, solapamientos * self.factor**2
+
+    def nueva_rejilla(self):
+        return self.backend.nueva_rejilla()
+
+    def sumar(self, rejilla, posicion):
+        nuevas, impactos = self.backend.sumar(rejilla, self._reducir(posicion))
+        return nuevas * self.factor**2, impactos * self.factor**2
+
+    def restar(self, rejilla, posicion):
+        perdidas, impactos = self.backend.restar(rejilla, self._reducir(posicion))
+        return perdidas * self.factor**2, impactos * self.factor**2
+
+    def ganancias_movimientos(self, rejilla, camaras, indices, dx, dy):
+        lote = getattr(self.backend, 'ganancias_movimientos', None)
+        if lote is None:
+            return None
+        ganancias = lote(rejilla, [self._reducir(c) for c in camaras], indices,
+                         [d / self.factor for d in dx], [d / self.factor for d in dy])
+        return None if ganancias is None else ganancias * self.factor**2
+
+
+class SeguidorCobertura:
+    """Conteo por celda que se actualiza al mover una sola cámara.
+
+    ``mover`` aplica el movimiento tocando solo el disco viejo y el nuevo y
+    devuelve el área resultante; ``confirmar`` lo consolida y ``deshacer``
+    revierte todos los movimientos pendientes.
+    """
+    def __init__(self, backend, camaras):
+        self.backend = backend
+        self.camaras = EstadoCamaras(camaras)
+        self.rejilla = backend.nueva_rejilla()
+        self.area = 0
+        self.impactos = 0
+        self._pendientes = []
+        for camara in self.camaras:
+            nuevas, impactos = backend.sumar(self.rejilla, camara)
+            self.area += nuevas
+            self.impactos += impactos
+
+    @property
+    def solapamientos(self):
+        return self.impactos - self.area
+
+    def _desplazar(self, i, posicion):
+        perdidas, quitados = self.backend.restar(self.rejilla, self.camaras[i])
+        nuevas, puestos = self.backend.sumar(self.rejilla, posicion)
+        self.area += nuevas - perdidas
+        self.impactos += puestos - quitados
+        self.camaras[i] = posicion
+
+    def mover(self, i, posicion):
+        """Área si la cámara i pasa a ``posicion`` (queda pendiente)"""
+        self._pendientes.append((i, self.camaras[i]))
+        self._desplazar(i, posicion)
+        return self.area
+
+    def areas_movimientos(self, indices, dx, dy):
+        """Área tras cada movimiento (i, dx, dy), sin aplicar ninguno.
+
+        Usa la evaluación en lote del backend si la tiene (y admite el caso);
+        si no, mueve y deshace cámara a cámara.
+        """
+        lote = getattr(self.backend, 'ganancias_movimientos', None)
+        ganancias = lote(self.rejilla, self.camaras, indices, dx, dy) if lote is not None else None
+        if ganancias is not None:
+            return (self.area + ganancias).tolist()
+        areas = []
+        for i, desp_x, desp_y in zip(indices, dx, dy):
+            x, y = self.camaras[i]
+            areas.append(self.mover(i, (x + desp_x, y + desp_y)))
+            self.deshacer()
+        return areas
+
+    def confirmar(self):
+        self._pendientes.clear()
+
+    def deshacer(self):
+        while self._pendientes:
+            self._desplazar(*self._pendientes.pop())
+
+
+class CacheEvaluacion:
+    """Caché LRU de áreas indexada por la configuración de cámaras.
+
+    La clave combina una huella de 64 bits por posición (número de cámaras,
+    suma y XOR de las huellas), así que no depende del orden de las cámaras y
+    mover una cámara la actualiza en O(1) con ``clave_movimiento``. Dos
+    configuraciones distintas solo comparten clave por una colisión de las
+    huellas, de probabilidad despreciable. Las áreas dependen del museo: usar
+    una caché por museo (y backend).
+    """
+    def __init__(self, capacidad=100000):
+        self.capacidad = capacidad
+        self._datos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    _MASCARA = (1 << 64) - 1
+
+    @classmethod
+    def _huella(cls, posicion):
+        """Hash de la posición mezclado (finalizador de splitmix64)"""
+        h = hash(posicion) & cls._MASCARA
+        h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & cls._MASCARA
+        h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & cls._MASCARA
+        return h ^ (h >> 31)
+
+    @classmethod
+    def clave(cls, estado):
+        """Clave de un estado completo, en O(n): se calcula una vez por estado"""
+        huellas = [cls._huella(p) for p in estado]
+        mezcla = 0
+        for h in huellas:
+            mezcla ^= h
+        return len(huellas), sum(huellas) & cls._MASCARA, mezcla
+
+    @classmethod
+    def clave_movimiento(cls, clave, anterior, posicion):
+        """Clave tras mover a ``posicion`` la cámara que estaba en ``anterior``, en O(1)"""
+        n, suma, mezcla = clave
+        h_anterior, h_nueva = cls._huella(anterior), cls._huella(posicion)
+        return n, (suma - h_anterior + h_nueva) & cls._MASCARA, mezcla ^ h_anterior ^ h_nueva
+
+    def obtener(self, clave):
+        """Área guardada o None si no está"""
+        valor = self._datos.get(clave)
+        if valor is None:
+            self.fallos += 1
+            return None
+        self._datos.move_to_end(clave)
+        self.aciertos += 1
+        return valor
+
+    def guardar(self, clave, valor):
+        self._datos[clave] = valor
+        self._datos.move_to_end(clave)
+        if len(self._datos) > self.capacidad:
+            self._datos.popitem(last=False)
+            self.desalojos += 1
+
+    def __len__(self):
+        return len(self._datos)
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'entradas': len(self._datos),
+            'capacidad': self.capacidad,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0
+        }
+
+
+BACKENDS = {
+    CoberturaConjunto.nombre: CoberturaConjunto,
+    CoberturaNumpy.nombre: CoberturaNumpy,
+    CoberturaExacta.nombre: CoberturaExacta,
+}
+
+
+def crear_cobertura(nombre, tamano, radio, plano=None, vision=False):
+    """Instancia un backend por nombre ('auto' elige numpy si está disponible)"""
+    if nombre in (None, "auto"):
+        nombre = "numpy" if np is not None else "conjunto"
+    if nombre not in BACKENDS:
+        raise ValueError(f"Backend de cobertura desconocido: {nombre!r} "
+                         f"(opciones: {', '.join(BACKENDS)})")
+    return BACKENDS[nombre](tamano, radio, plano, vision)
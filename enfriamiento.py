@@ -0,0 +1,150 @@
+# enfriamiento.py - Calendarios de enfriamiento del Simulated Annealing
+import math
+import statistics
+
+
+class Enfriamiento:
+    """Decide la temperatura de la iteración siguiente del recocido.
+
+    ``actualizar(temperatura, resultado)`` recibe el resultado de la
+    iteración (True aceptado, False rechazado, None vecino infactible) y
+    devuelve la nueva temperatura. Cada calendario implementa
+    ``_enfriar``. Con ``paciencia``, tras ese número de iteraciones sin
+    mejorar el mejor global se recalienta hasta la temperatura a la que se
+    mejoró por última vez, como mucho ``recalentamientos`` veces.
+    """
+    nombre = None
+    PARAMETROS = ('factor', 'paciencia', 'recalentamientos')
+
+    def __init__(self, factor=0.95, paciencia=None, recalentamientos=3):
+        if not 0 < factor < 1:
+            raise ValueError("El factor de enfriamiento debe estar en (0, 1)")
+        self.factor = factor
+        self.paciencia = paciencia
+        self.recalentamientos = recalentamientos
+        self.reiniciar(1000, 0.1)
+
+    def configuracion(self):
+        return {'nombre': self.nombre, **{p: getattr(self, p) for p in self.PARAMETROS}}
+
+    def reiniciar(self, temp_inicial, temp_final):
+        """Empieza una búsqueda nueva en el rango [temp_final, temp_inicial]"""
+        self.temp_inicial = temp_inicial
+        self.temp_final = temp_final
+        self.recalentados = 0
+        self._sin_mejora = 0
+        self._temp_mejora = temp_inicial
+
+    def mejora(self, temperatura):
+        """El mejor global acaba de mejorar a esta temperatura"""
+        self._sin_mejora = 0
+        self._temp_mejora = temperatura
+
+    def actualizar(self, temperatura, resultado):
+        temperatura = self._enfriar(temperatura, resultado)
+        if self.paciencia is not None:
+            self._sin_mejora += 1
+            if self._sin_mejora >= self.paciencia and self.recalentados < self.recalentamientos:
+                self.recalentados += 1
+                self._sin_mejora = 0
+                temperatura = max(temperatura, self._temp_mejora)
+        return temperatura
+
+    def _enfriar(self, temperatura, resultado):
+        raise NotImplementedError
+
+
+class EnfriamientoGeometrico(Enfriamiento):
+    """T ← factor·T en cada iteración, también con vecinos infactibles (calendario original)"""
+    nombre = "geometrico"
+
+    def _enfriar(self, temperatura, resultado):
+        return temperatura * self.factor
+
+
+class EnfriamientoMesetas(Enfriamiento):
+    """Mantiene cada temperatura durante ``iteraciones`` vecinos factibles"""
+    nombre = "mesetas"
+    PARAMETROS = Enfriamiento.PARAMETROS + ('iteraciones',)
+
+    def __init__(self, factor=0.95, iteraciones=20, **opciones):
+        self.iteraciones = iteraciones
+        super().__init__(factor, **opciones)
+
+    def reiniciar(self, temp_inicial, temp_final):
+        super().reiniciar(temp_inicial, temp_final)
+        self._factibles = 0
+        self._aceptados = 0
+
+    def _enfriar(self, temperatura, resultado):
+        if resultado is None:
+            return temperatura
+        self._factibles += 1
+        self._aceptados += resultado
+        if self._factibles < self.iteraciones:
+            return temperatura
+        temperatura = self._fin_meseta(temperatura, self._aceptados / self._factibles)
+        self._factibles = 0
+        self._aceptados = 0
+        return temperatura
+
+    def _fin_meseta(self, temperatura, aceptacion):
+        return temperatura * self.factor
+
+
+class EnfriamientoAdaptativo(EnfriamientoMesetas):
+    """Mesetas cuyo enfriamiento persigue una tasa de aceptación objetivo.
+
+    El objetivo baja geométricamente de ``aceptacion_inicial`` a
+    ``aceptacion_final`` según el avance logarítmico de T en su rango. Si en
+    la meseta se aceptó más de lo previsto se enfría con factor², si menos
+    con √factor: se pasa más tiempo donde la búsqueda se congela.
+    """
+    nombre = "adaptativo"
+    PARAMETROS = EnfriamientoMesetas.PARAMETROS + ('aceptacion_inicial', 'aceptacion_final')
+
+    def __init__(self, factor=0.95, iteraciones=20, aceptacion_inicial=0.5, aceptacion_final=0.02,
+                 **opciones):
+        self.aceptacion_inicial = aceptacion_inicial
+        self.aceptacion_final = aceptacion_final
+        super().__init__(factor, iteraciones, **opciones)
+
+    def objetivo(self, temperatura):
+        """Tasa de aceptación buscada a esta temperatura"""
+        avance = math.log(self.temp_inicial / temperatura) / math.log(self.temp_inicial / self.temp_final)
+        avance = min(1.0, max(0.0, avance))
+        return self.aceptacion_inicial * (self.aceptacion_final / self.aceptacion_inicial) ** avance
+
+    def _fin_meseta(self, temperatura, aceptacion):
+        if aceptacion > self.objetivo(temperatura):
+            return temperatura * self.factor ** 2
+        return temperatura * math.sqrt(self.factor)
+
+
+def calibrar_temperaturas(deltas, aceptacion_inicial=0.8, aceptacion_final=0.001):
+    """(T0, Tf) a partir de deltas de área muestreados, o None si ninguno empeora.
+
+    T0 acepta el empeoramiento medio con probabilidad ``aceptacion_inicial``
+    y Tf el menor empeoramiento con probabilidad ``aceptacion_final``.
+    """
+    empeoramientos = [-d for d in deltas if d < 0]
+    if not empeoramientos:
+        return None
+    t0 = statistics.fmean(empeoramientos) / -math.log(aceptacion_inicial)
+    tf = min(empeoramientos) / -math.log(aceptacion_final)
+    return t0, min(t0, tf)
+
+
+ENFRIAMIENTOS = {
+    EnfriamientoGeometrico.nombre: EnfriamientoGeometrico,
+    EnfriamientoMesetas.nombre: EnfriamientoMesetas,
+    EnfriamientoAdaptativo.nombre: EnfriamientoAdaptativo,
+}
+
+
+def crear_enfriamiento(nombre, **opciones):
+    """Instancia un calendario de enfriamiento por nombre"""
+    if nombre not in ENFRIAMIENTOS:
+        raise ValueError(f"Calendario de enfriamiento desconocido: {nombre!r} "
+                         f"(opciones: {', '.join(ENFRIAMIENTOS)})")
+    return ENFRIAMIENTOS[nombre](**opciones)
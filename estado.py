@@ -0,0 +1,82 @@
+# estado.py - Estado compacto de la búsqueda: posiciones de las cámaras en un array
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # sin numpy no hay vista (n, 2), el resto funciona igual
+    np = None
+
+
+class EstadoCamaras:
+    """Posiciones de n cámaras en un único array plano ``[x0, y0, x1, y1, ...]``.
+
+    Se comporta como una secuencia de tuplas (x, y): indexar, iterar, ``len``
+    y ``==`` funcionan igual que con una lista, así que el resto del código no
+    distingue entre ambos. Las coordenadas se guardan como enteros de 64 bits
+    mientras todas lo sean y pasan a reales si se coloca una que no lo es.
+    Los movimientos se aplican en el sitio con ``estado[i] = posicion``; con
+    numpy, ``np.asarray`` da una vista (n, 2) sin copia.
+    """
+    __slots__ = ('_datos',)
+
+    def __init__(self, camaras=()):
+        coordenadas = [c for posicion in camaras for c in posicion]
+        tipo = 'q' if all(isinstance(c, int) for c in coordenadas) else 'd'
+        self._datos = array(tipo, coordenadas)
+
+    def __len__(self):
+        return len(self._datos) // 2
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+            if i < 0:
+                raise IndexError("índice de cámara fuera de rango")
+        datos = self._datos
+        return datos[2 * i], datos[2 * i + 1]
+
+    def __setitem__(self, i, posicion):
+        if i < 0:
+            i += len(self)
+        x, y = posicion
+        try:
+            self._datos[2 * i] = x
+            self._datos[2 * i + 1] = y
+        except TypeError:  # coordenada real en un array de enteros
+            self._datos = array('d', self._datos)
+            self._datos[2 * i] = x
+            self._datos[2 * i + 1] = y
+
+    def __iter__(self):
+        return zip(self._datos[0::2], self._datos[1::2])
+
+    def __eq__(self, otro):
+        if isinstance(otro, EstadoCamaras):
+            return self._datos == otro._datos
+        if isinstance(otro, (list, tuple)):
+            return list(self) == list(otro)
+        return NotImplemented
+
+    __hash__ = None  # mutable
+
+    def __repr__(self):
+        return f"EstadoCamaras({list(self)!r})"
+
+    def __reduce__(self):
+        # Como lista: pickle codifica los enteros pequeños en menos bytes que el array
+        return EstadoCamaras, (list(self),)
+
+    def __array__(self, dtype=None, copy=None):
+        vista = np.frombuffer(self._datos, dtype=np.int64 if self._datos.typecode == 'q' else np.float64)
+        vista = vista.reshape(-1, 2)
+        vista.flags.writeable = False  # solo lectura: el estado se cambia con []
+        if dtype is not None:
+            vista = vista.astype(dtype, copy=False)
+        return vista.copy() if copy else vista
+
+    def copy(self):
+        nuevo = EstadoCamaras.__new__(EstadoCamaras)
+        nuevo._datos = self._datos[:]
+        return nuevo
@@ -0,0 +1,263 @@
+# inicializacion.py - Estrategias para generar el estado inicial de la búsqueda
+import heapq
+import math
+
+
+class Inicializador:
+    """Coloca ``num_camaras`` cámaras sin solapamiento dentro de [radio, tamano - radio]
+    y en posiciones válidas del plano (``museo.es_valido``).
+
+    Cada estrategia implementa ``_colocar(rng)``. Si se queda corta,
+    ``generar`` recurre a la mejor rejilla regular (hexagonal en ambas
+    orientaciones o cuadrada), así que siempre devuelve el número pedido
+    cuando cabe en alguna de ellas; si no cabe, devuelve tantas como quepan.
+    """
+    nombre = None
+
+    def __init__(self, museo):
+        self.museo = museo
+
+    def generar(self, rng):
+        camaras = self._colocar(rng)
+        if len(camaras) < self.museo.num_camaras:
+            rejilla = muestrear_rejilla(self.museo, rng)
+            if len(rejilla) > len(camaras):
+                camaras = rejilla
+        return camaras
+
+    def _colocar(self, rng):
+        raise NotImplementedError
+
+    def _limites(self):
+        """Rango entero de coordenadas con el disco entero dentro del museo"""
+        return math.ceil(self.museo.radio), math.floor(self.museo.tamano - self.museo.radio)
+
+
+class InicializadorAleatorio(Inicializador):
+    """Muestreo por rechazo con 500 intentos (implementación original)"""
+    nombre = "aleatorio"
+
+    def _colocar(self, rng):
+        camaras = []
+        indice = self.museo.crear_indice()
+        intentos = 0
+        while len(camaras) < self.museo.num_camaras and intentos < 500:
+            x = rng.randint(self.museo.radio, self.museo.tamano - self.museo.radio)
+            y = rng.randint(self.museo.radio, self.museo.tamano - self.museo.radio)
+            posicion = (x, y)
+            if self.museo.es_valido(posicion) and not indice.hay_conflicto(posicion):
+                indice.agregar(len(camaras), posicion)
+                camaras.append(posicion)
+            intentos += 1
+        return camaras
+
+
+class InicializadorPoisson(Inicializador):
+    """Muestreo de disco de Poisson (Bridson) con distancia mínima d ≥ 2·radio.
+
+    Crece desde un punto aleatorio proponiendo ``intentos`` candidatos en la
+    corona [d, 2d] de cada punto activo hasta llenar el museo, y elige
+    ``num_camaras`` puntos al azar de esa distribución maximal. Para que el
+    coste no dependa del tamaño del museo, d se ensancha hasta que caben del
+    orden de ``muestras``·num_camaras puntos; si con ella no salen bastantes
+    (planos estrechos), se reduce a la mitad hasta llegar a 2·radio. Una
+    rejilla de fondo de lado d hace que el coste sea lineal en el número de
+    puntos.
+    """
+    nombre = "poisson"
+    intentos = 30
+    muestras = 4
+
+    def _colocar(self, rng):
+        bajo, alto = self._limites()
+        if bajo > alto:
+            return []
+        minima = 2 * self.museo.radio
+        num_camaras = self.museo.num_camaras
+        lado = alto - bajo + 1
+        distancia = max(minima, lado / math.sqrt(self.muestras * max(1, num_camaras)))
+        while True:
+            puntos = self._bridson(rng, bajo, alto, distancia)
+            if len(puntos) >= num_camaras or distancia <= minima:
+                break
+            distancia = max(minima, distancia / 2)
+
+        if len(puntos) <= num_camaras:
+            return puntos
+        return rng.sample(puntos, num_camaras)
+
+    def _bridson(self, rng, bajo, alto, distancia):
+        """Distribución maximal de puntos a distancia ≥ ``distancia`` en [bajo, alto]²"""
+        for _ in range(1000):
+            semilla = (rng.randint(bajo, alto), rng.randint(bajo, alto))
+            if self.museo.es_valido(semilla):
+                break
+        else:
+            return []
+        celdas = {}
+
+        def celda(punto):
+            return math.floor(punto[0] / distancia), math.floor(punto[1] / distancia)
+
+        def libre(candidato):
+            cx, cy = celda(candidato)
+            return not any(math.sqrt((p[0] - candidato[0])**2 + (p[1] - candidato[1])**2) < distancia
+                           for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                           for p in celdas.get((cx + dx, cy + dy), ()))
+
+        puntos = [semilla]
+        celdas[celda(semilla)] = [semilla]
+        activos = [0]
+
+        while activos:
+            k = rng.randrange(len(activos))
+            x, y = puntos[activos[k]]
+            for _ in range(self.intentos):
+                angulo = rng.uniform(0, 2 * math.pi)
+                r = rng.uniform(distancia, 2 * distancia)
+                candidato = (round(x + r * math.cos(angulo)), round(y + r * math.sin(angulo)))
+                if (bajo <= candidato[0] <= alto and bajo <= candidato[1] <= alto
+                        and self.museo.es_valido(candidato) and libre(candidato)):
+                    celdas.setdefault(celda(candidato), []).append(candidato)
+                    activos.append(len(puntos))
+                    puntos.append(candidato)
+                    break
+            else:
+                # Sin hueco alrededor: el punto deja de estar activo
+                activos[k] = activos[-1]
+                activos.pop()
+        return puntos
+
+
+class InicializadorHexagonal(Inicializador):
+    """Rejilla hexagonal (la más densa) desplazada al azar dentro del museo"""
+    nombre = "hexagonal"
+
+    def _colocar(self, rng):
+        return muestrear_rejilla(self.museo, rng)
+
+
+class InicializadorVoraz(Inicializador):
+    """Máxima cobertura voraz sobre una rejilla de candidatos de paso radio/2.
+
+    Cada paso añade el candidato compatible con mayor ganancia de área según
+    el backend de cobertura del museo. Las ganancias solo pueden bajar al
+    añadir cámaras, así que se recalculan de forma perezosa (montículo): solo
+    se reevalúa el candidato de la cima.
+    """
+    nombre = "voraz"
+
+    def _colocar(self, rng):
+        return self.ampliar([], rng)
+
+    def ampliar(self, camaras, rng, paso=None):
+        """Añade cámaras a ``camaras`` (ya colocadas) hasta ``num_camaras`` o hasta que no quepan más.
+
+        ``paso`` cambia la separación de la rejilla de candidatos (por defecto radio/2).
+        """
+        camaras = list(camaras)
+        bajo, alto = self._limites()
+        if bajo > alto:
+            return camaras
+        backend = self.museo.cobertura
+        rejilla = backend.nueva_rejilla()
+        indice = self.museo.crear_indice()
+        for i, camara in enumerate(camaras):
+            backend.sumar(rejilla, camara)
+            indice.agregar(i, camara)
+        if paso is None:
+            paso = max(1, int(self.museo.radio // 2))
+        candidatos = [(x, y) for x in range(bajo, alto + 1, paso) for y in range(bajo, alto + 1, paso)
+                      if self.museo.es_valido((x, y))]
+        rng.shuffle(candidatos)  # desempate aleatorio entre ganancias iguales
+        monticulo = [(-math.inf, orden, candidato) for orden, candidato in enumerate(candidatos)]
+
+        while monticulo and len(camaras) < self.museo.num_camaras:
+            _, orden, candidato = heapq.heappop(monticulo)
+            if indice.hay_conflicto(candidato):
+                continue  # los conflictos no desaparecen al añadir cámaras
+            ganancia = self._ganancia(backend, rejilla, candidato)
+            if monticulo and -monticulo[0][0] > ganancia:
+                heapq.heappush(monticulo, (-ganancia, orden, candidato))
+                continue
+            backend.sumar(rejilla, candidato)
+            indice.agregar(len(camaras), candidato)
+            camaras.append(candidato)
+        return camaras
+
+    @staticmethod
+    def _ganancia(backend, rejilla, posicion):
+        nuevas, _ = backend.sumar(rejilla, posicion)
+        backend.restar(rejilla, posicion)
+        return nuevas
+
+
+def puntos_rejilla(bajo, alto, paso_x, paso_y, desfase, rng):
+    """Rejilla de filas separadas ``paso_y``, con las filas impares desplazadas ``desfase``.
+
+    El origen se desplaza al azar dentro de la holgura para variar entre reinicios.
+    """
+    lado = alto - bajo
+    filas = lado // paso_y + 1
+    columnas = lado // paso_x + 1
+    x0 = bajo + rng.randint(0, lado - (columnas - 1) * paso_x)
+    y0 = bajo + rng.randint(0, lado - (filas - 1) * paso_y)
+    puntos = []
+    for f in range(filas):
+        for c in range(columnas):
+            x = x0 + c * paso_x + (desfase if f % 2 else 0)
+            if x <= alto:
+                puntos.append((x, y0 + f * paso_y))
+    return puntos
+
+
+def muestrear_rejilla(museo, rng):
+    """``num_camaras`` puntos de la rejilla regular con más huecos.
+
+    Prueba la rejilla hexagonal (filas a distancia ⌈√3·r⌉) en las dos
+    orientaciones y la cuadrada; si ninguna llega a ``num_camaras`` se usan
+    todos los puntos de la mayor.
+    """
+    radio = museo.radio
+    bajo, alto = math.ceil(radio), math.floor(museo.tamano - radio)
+    if bajo > alto:
+        return []
+    paso = max(1, math.ceil(2 * radio))
+    paso_fila = max(1, math.ceil(math.sqrt(3) * radio))
+    hexagonal = puntos_rejilla(bajo, alto, paso, paso_fila, math.ceil(radio), rng)
+    opciones = [
+        hexagonal,
+        [(y, x) for x, y in hexagonal],
+        puntos_rejilla(bajo, alto, paso, paso, 0, rng),
+    ]
+    # Se descartan los puntos fuera del plano y los que los redondeos con
+    # radios no enteros hayan acercado demasiado
+    mejor = []
+    for puntos in opciones:
+        validos = []
+        indice = museo.crear_indice()
+        for punto in puntos:
+            if museo.es_valido(punto) and not indice.hay_conflicto(punto):
+                indice.agregar(len(validos), punto)
+                validos.append(punto)
+        if len(validos) >= museo.num_camaras:
+            return rng.sample(validos, museo.num_camaras)
+        if len(validos) > len(mejor):
+            mejor = validos
+    return mejor
+
+
+INICIALIZADORES = {
+    InicializadorAleatorio.nombre: InicializadorAleatorio,
+    InicializadorPoisson.nombre: InicializadorPoisson,
+    InicializadorHexagonal.nombre: InicializadorHexagonal,
+    InicializadorVoraz.nombre: InicializadorVoraz,
+}
+
+
+def crear_inicializador(nombre, museo):
+    """Instancia una estrategia de estado inicial por nombre"""
+    if nombre not in INICIALIZADORES:
+        raise ValueError(f"Inicializador desconocido: {nombre!r} "
+                         f"(opciones: {', '.join(INICIALIZADORES)})")
+    return INICIALIZADORES[nombre](museo)
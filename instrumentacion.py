@@ -0,0 +1,85 @@
+# instrumentacion.py - Contadores y cronómetros opcionales de las fases de búsqueda
+import cProfile
+import contextlib
+import time
+
+
+class _Fase:
+    """Cronómetro de una fase (context manager)"""
+    __slots__ = ("instrumentacion", "nombre", "inicio")
+
+    def __init__(self, instrumentacion, nombre):
+        self.instrumentacion = instrumentacion
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        instr = self.instrumentacion
+        instr.tiempos[self.nombre] = instr.tiempos.get(self.nombre, 0.0) + time.perf_counter() - self.inicio
+        instr.llamadas[self.nombre] = instr.llamadas.get(self.nombre, 0) + 1
+        return False
+
+
+class Instrumentacion:
+    """Contadores y tiempos acumulados por fase (evaluación, vecinos, interfaz...).
+
+    Las fases pueden anidarse: 'solapamiento' se mide también dentro de
+    'vecinos' y de la generación del estado inicial.
+    """
+    activa = True
+
+    def __init__(self):
+        self.contadores = {}
+        self.tiempos = {}
+        self.llamadas = {}
+
+    def contar(self, nombre, n=1):
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + n
+
+    def fase(self, nombre):
+        return _Fase(self, nombre)
+
+    def fusionar(self, resumen):
+        """Suma el resumen de otra instrumentación (p. ej. de un proceso trabajador)"""
+        for nombre, n in resumen['contadores'].items():
+            self.contar(nombre, n)
+        for nombre, fase in resumen['fases'].items():
+            self.tiempos[nombre] = self.tiempos.get(nombre, 0.0) + fase['tiempo']
+            self.llamadas[nombre] = self.llamadas.get(nombre, 0) + fase['llamadas']
+
+    def resumen(self):
+        return {
+            'contadores': dict(self.contadores),
+            'fases': {nombre: {'tiempo': self.tiempos[nombre], 'llamadas': self.llamadas[nombre]}
+                      for nombre in self.tiempos}
+        }
+
+
+class InstrumentacionNula:
+    """Instrumentación desactivada: cada gancho cuesta una llamada vacía"""
+    activa = False
+    _fase = contextlib.nullcontext()
+
+    def contar(self, nombre, n=1):
+        pass
+
+    def fase(self, nombre):
+        return self._fase
+
+    def resumen(self):
+        return None
+
+
+INSTRUMENTACION_NULA = InstrumentacionNula()
+
+
+def perfilar(funcion, ruta):
+    """Ejecuta ``funcion()`` bajo cProfile y guarda las estadísticas (pstats) en ``ruta``"""
+    perfil = cProfile.Profile()
+    try:
+        return perfil.runcall(funcion)
+    finally:
+        perfil.dump_stats(ruta)
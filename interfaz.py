@@ -1,13 +1,69 @@
 # interfaz.py - Interfaz de usuario y ejecución
 import tkinter as tk
 from tkinter import ttk, messagebox
+import queue
+import threading
 import time
 import traceback
 from modelo import Museo, VelocidadControl
 from agentes import AgenteSecuencial  # Importa el orquestador
+from telemetria import Telemetria
+
+
+class BusquedaCancelada(Exception):
+    """Se lanza en el hilo de búsqueda cuando el usuario reinicia"""
+
+
+class InterfazCola:
+    """Interfaz que usan los agentes desde el hilo de búsqueda.
+
+    No toca Tk: los mensajes del log se encolan todos, y de la visualización
+    y las estadísticas solo se guarda la última instantánea, de modo que los
+    cuadros intermedios se descartan si la interfaz no llega a dibujarlos.
+    """
+    def __init__(self, museo, velocidad):
+        self.museo = museo
+        self.velocidad = velocidad
+        self.mensajes = queue.Queue()
+        self.cancelada = False
+        self.error = None
+        self._lock = threading.Lock()
+        self._cuadro = None
+        self._stats = None
+    
+    def _comprobar(self):
+        if self.cancelada:
+            raise BusquedaCancelada()
+    
+    def log(self, mensaje):
+        self._comprobar()
+        self.mensajes.put(mensaje)
+    
+    def actualizar_visualizacion(self):
+        self._comprobar()
+        cuadro = list(self.museo.camaras)
+        with self._lock:
+            self._cuadro = cuadro
+    
+    def actualizar_stats(self, iteracion, area_actual, mejor_area, algoritmo):
+        self._comprobar()
+        stats = (iteracion, area_actual, mejor_area, algoritmo, self.museo.solapamientos)
+        with self._lock:
+            self._stats = stats
+    
+    def tomar(self):
+        """Último cuadro y estadísticas publicados (None si no hay nada nuevo)"""
+        with self._lock:
+            cuadro, stats = self._cuadro, self._stats
+            self._cuadro = self._stats = None
+        return cuadro, stats
+
 
 class InterfazMuseo:
     """Vista de la aplicación (Patrón MVC)"""
+    fps = 30  # frecuencia de refresco del canvas durante la búsqueda
+    escala = 6  # píxeles por metro
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Agente IA")
@@ -17,6 +73,10 @@ class InterfazMuseo:
         self.agente = None
         self.ejecutando = False
         self.velocidad = VelocidadControl()
+        self.cola = None
+        self.hilo = None
+        self.telemetria = None
+        self.eventos = None
         
         self._crear_widgets()
         
@@ -43,7 +103,7 @@ class InterfazMuseo:
         
         # Velocidad de animación
         ttk.Label(control_frame, text="⚡ Velocidad:", font=("Arial", 12, "bold")).grid(row=2, column=0, pady=10, sticky=tk.W)
-        self.velocidad_slider = ttk.Scale(control_frame, from_=0.1, to=2.0, orient=tk.HORIZONTAL, command=self._cambiar_velocidad)
+        self.velocidad_slider = ttk.Scale(control_frame, from_=0.0, to=2.0, orient=tk.HORIZONTAL, command=self._cambiar_velocidad)
         self.velocidad_slider.set(0.5)
         self.velocidad_slider.grid(row=3, column=0, sticky=(tk.W, tk.E))
         
@@ -65,7 +125,8 @@ class InterfazMuseo:
         stats_frame.grid(row=5, column=0, pady=20, sticky=(tk.W, tk.E))
         
         self.stats_labels = {}
-        for i, stat in enumerate(["Iter/Nodo", "Área Actual", "Mejor Área", "Solapamientos", "Algoritmo"]):
+        for i, stat in enumerate(["Iter/Nodo", "Área Actual", "Mejor Área", "Solapamientos", "Algoritmo",
+                                     "Eval/s", "Temperatura"]):
             ttk.Label(stats_frame, text=f"{stat}:", font=("Arial", 10, "bold")).grid(row=i, column=0, sticky=tk.W)
             self.stats_labels[stat] = ttk.Label(stats_frame, text="0", font=("Arial", 10))
             self.stats_labels[stat].grid(row=i, column=1, sticky=tk.W)
@@ -86,14 +147,23 @@ class InterfazMuseo:
         self._dibujar_museo()
     
     def _dibujar_museo(self):
-        """Dibuja el plano del museo"""
+        """Dibuja el plano del museo y olvida los ítems de cámaras anteriores"""
         self.canvas.delete("all")
-        escala = 6
+        self._items_camaras = []
+        escala = self.escala
         
         # Borde principal
-        self.canvas.create_rectangle(10, 10, 10 + self.museo.tamano*escala, 
-                                     10 + self.museo.tamano*escala, 
-                                     outline="black", width=3)
+        plano = self.museo.plano
+        if plano is None:
+            self.canvas.create_rectangle(10, 10, 10 + self.museo.tamano*escala, 
+                                         10 + self.museo.tamano*escala, 
+                                         outline="black", width=3)
+        else:
+            self.canvas.create_polygon(*self._coords_poligono(plano.contorno),
+                                       fill="", outline="black", width=3)
+            for obstaculo in plano.obstaculos:
+                self.canvas.create_polygon(*self._coords_poligono(obstaculo),
+                                           fill="gray60", outline="black", width=1)
         
         # Cuadrícula y graduaciones
         for i in range(0, self.museo.tamano + 1, 20):
@@ -104,48 +174,89 @@ class InterfazMuseo:
             self.canvas.create_text(5, 10 + (self.museo.tamano - i)*escala, 
                                    text=str(i), font=("Arial", 8))
     
-    def actualizar_visualizacion(self):
-        """Actualiza posiciones de cámaras en el canvas"""
-        self._dibujar_museo()
-        escala = 6
+    def _coords_poligono(self, poligono):
+        """Vértices de un polígono del plano en coordenadas del canvas"""
+        return [c for x, y in poligono
+                for c in (10 + x * self.escala, 10 + (self.museo.tamano - y) * self.escala)]
+    
+    def _coords_camara(self, x, y):
+        """Coordenadas en el canvas del disco, el centro y la etiqueta de una cámara"""
+        canvas_x = 10 + x * self.escala
+        canvas_y = 10 + (self.museo.tamano - y) * self.escala
+        radio_px = self.museo.radio * self.escala
+        return ((canvas_x - radio_px, canvas_y - radio_px, canvas_x + radio_px, canvas_y + radio_px),
+                (canvas_x - 4, canvas_y - 4, canvas_x + 4, canvas_y + 4),
+                (canvas_x, canvas_y))
+    
+    def actualizar_visualizacion(self, camaras=None):
+        """Actualiza posiciones de cámaras en el canvas.
         
-        for i, (x, y) in enumerate(self.museo.camaras):
-            canvas_x = 10 + x * escala
-            canvas_y = 10 + (self.museo.tamano - y) * escala
-            radio_px = self.museo.radio * escala
+        El plano se dibuja una sola vez y cada cámara conserva sus ítems
+        (disco, centro, etiqueta): solo se mueven con ``canvas.coords`` las
+        cámaras que cambiaron de posición.
+        """
+        if camaras is None:
+            camaras = self.museo.camaras
+        
+        for i, posicion in enumerate(camaras):
+            if i < len(self._items_camaras):
+                disco, centro, etiqueta, anterior = self._items_camaras[i]
+                if posicion == anterior:
+                    continue
+                coords_disco, coords_centro, coords_etiqueta = self._coords_camara(*posicion)
+                self.canvas.coords(disco, *coords_disco)
+                self.canvas.coords(centro, *coords_centro)
+                self.canvas.coords(etiqueta, *coords_etiqueta)
+                self._items_camaras[i] = (disco, centro, etiqueta, posicion)
+                continue
+            
+            coords_disco, coords_centro, coords_etiqueta = self._coords_camara(*posicion)
             
             # Área de cobertura
             color = f"#{(i*25)%255:02x}{(i*40)%255:02x}ff"
-            self.canvas.create_oval(
-                canvas_x - radio_px, canvas_y - radio_px,
-                canvas_x + radio_px, canvas_y + radio_px,
-                fill=color, stipple="gray12", outline=color, width=2
-            )
+            disco = self.canvas.create_oval(*coords_disco, fill=color, stipple="gray12",
+                                            outline=color, width=2)
             
             # Cámara (centro)
-            self.canvas.create_oval(canvas_x - 4, canvas_y - 4, canvas_x + 4, canvas_y + 4, 
-                                   fill="red", width=2)
-            self.canvas.create_text(canvas_x, canvas_y, text=str(i+1), 
-                                   fill="white", font=("Arial", 8, "bold"))
+            centro = self.canvas.create_oval(*coords_centro, fill="red", width=2)
+            etiqueta = self.canvas.create_text(*coords_etiqueta, text=str(i+1), 
+                                               fill="white", font=("Arial", 8, "bold"))
+            self._items_camaras.append((disco, centro, etiqueta, posicion))
         
-        self.root.update()
+        # Cámaras que ya no existen
+        for disco, centro, etiqueta, _ in self._items_camaras[len(camaras):]:
+            self.canvas.delete(disco, centro, etiqueta)
+        del self._items_camaras[len(camaras):]
     
-    def actualizar_stats(self, iteracion, area_actual, mejor_area, algoritmo):
+    def actualizar_stats(self, iteracion, area_actual, mejor_area, algoritmo, solapamientos=None):
         """Actualiza las estadísticas en pantalla"""
+        if solapamientos is None:
+            solapamientos = self.museo.solapamientos
         self.stats_labels["Iter/Nodo"].config(text=str(iteracion))
         self.stats_labels["Área Actual"].config(text=f"{area_actual:.1f} m²")
         self.stats_labels["Mejor Área"].config(text=f"{mejor_area:.1f} m²")
-        self.stats_labels["Solapamientos"].config(text=str(self.museo.solapamientos))
+        self.stats_labels["Solapamientos"].config(text=str(solapamientos))
         self.stats_labels["Algoritmo"].config(text=algoritmo)
     
+    def actualizar_telemetria(self, evento):
+        """Muestra el ritmo de evaluación y la temperatura del último evento de progreso"""
+        eval_por_segundo, temperatura = evento['eval_por_segundo'], evento['temperatura']
+        self.stats_labels["Eval/s"].config(text="-" if eval_por_segundo is None else f"{eval_por_segundo:.0f}")
+        self.stats_labels["Temperatura"].config(text="-" if temperatura is None else f"{temperatura:.2f}")
+    
     def log(self, mensaje):
         """Añade mensaje al log"""
         timestamp = time.strftime("%H:%M:%S")
         self.log_text.insert("1.0", f"[{timestamp}] {mensaje}\n")
     
     def iniciar(self):
-        """Inicia la ejecución secuencial"""
+        """Inicia la ejecución secuencial (o la reanuda si está en pausa)"""
         if self.ejecutando:
+            if self.velocidad.pausado:
+                self.velocidad.reanudar()
+                self.btn_iniciar.config(state=tk.DISABLED)
+                self.btn_pausar.config(state=tk.NORMAL)
+                self.log("▶ Ejecución reanudada")
             return
         
         self.ejecutando = True
@@ -153,38 +264,79 @@ class InterfazMuseo:
         self.btn_pausar.config(state=tk.NORMAL)
         self.log_text.delete("1.0", tk.END)
         
-        # Crear orquestador
-        self.agente = AgenteSecuencial(self.museo, self)
+        # Crear orquestador: los agentes solo ven la interfaz de la cola
+        self.cola = InterfazCola(self.museo, self.velocidad)
+        # Solo interesa el último evento: la búsqueda nunca espera a la interfaz
+        self.telemetria = Telemetria(intervalo=1 / self.fps)
+        self.eventos = self.telemetria.suscribir(capacidad=1)
+        self.agente = AgenteSecuencial(self.museo, self.cola, self.telemetria)
         
         self.log("🎬 INICIANDO EJECUCIÓN SECUENCIAL...")
         self.log("📌 Algoritmo 1/2: Hill Climbing")
-        self.root.update()
-        time.sleep(1)
         
-        # Ejecutar en segundo plano
-        self.root.after(100, self._ejecutar)
+        # Ejecutar en un hilo: Tk solo se toca desde _sondear
+        self.hilo = threading.Thread(target=self._ejecutar, args=(self.agente, self.cola), daemon=True)
+        self.hilo.start()
+        self.root.after(1000 // self.fps, self._sondear, self.cola)
     
-    def _ejecutar(self):
-        """Ejecuta el agente secuencial (CORRECCIÓN DEL BUG)"""
+    def _ejecutar(self, agente, cola):
+        """Ejecuta el agente secuencial en el hilo de búsqueda"""
         try:
-            # Llamar al método CORRECTO del AgenteSecuencial
-            self.agente.ejecutar_todos()
+            agente.ejecutar_todos()
+        except BusquedaCancelada:
+            pass
         except Exception as e:
+            # El error se muestra desde el hilo de Tk
+            cola.error = f"Error en ejecución:\n{e}\n\n{traceback.format_exc()}"
+    
+    def _sondear(self, cola):
+        """Vuelca la cola del hilo de búsqueda en pantalla a frecuencia fija"""
+        if cola is not self.cola:  # ejecución reiniciada
+            return
+        terminado = not self.hilo.is_alive()
+        
+        while True:
+            try:
+                self.log(cola.mensajes.get_nowait())
+            except queue.Empty:
+                break
+        
+        cuadro, stats = cola.tomar()
+        if cuadro is not None:
+            self.actualizar_visualizacion(cuadro)
+        if stats is not None:
+            self.actualizar_stats(*stats)
+        evento = self.eventos.siguiente(0)
+        if evento is not None and evento['tipo'] == 'progreso':
+            self.actualizar_telemetria(evento)
+        
+        if not terminado:
+            self.root.after(1000 // self.fps, self._sondear, cola)
+            return
+        
+        self.ejecutando = False
+        self.cola = None
+        self.btn_iniciar.config(state=tk.NORMAL)
+        self.btn_pausar.config(state=tk.DISABLED)
+        if cola.error is not None:
             # Mostrar error detallado para debugging
-            messagebox.showerror("Error", f"Error en ejecución:\n{e}\n\n{traceback.format_exc()}")
-        finally:
-            self.ejecutando = False
-            self.btn_iniciar.config(state=tk.NORMAL)
-            self.btn_pausar.config(state=tk.DISABLED)
+            messagebox.showerror("Error", cola.error)
     
     def pausar(self):
-        """Pausa la ejecución"""
+        """Pausa la ejecución (el hilo de búsqueda se bloquea en su próxima espera)"""
         self.velocidad.pausar()
         self.btn_iniciar.config(state=tk.NORMAL)
         self.btn_pausar.config(state=tk.DISABLED)
+        self.log("⏸ Ejecución en pausa")
     
     def reiniciar(self):
         """Reinicia todo el sistema"""
+        if self.cola is not None:
+            # El hilo de búsqueda termina en su próxima llamada a la interfaz
+            self.cola.cancelada = True
+            self.cola = None
+            self.telemetria.detener()
+            self.eventos.cerrar()
         self.ejecutando = False
         self.velocidad.reanudar()
         self.museo.camaras = []
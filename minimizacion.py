@@ -0,0 +1,212 @@
+# minimizacion.py - Menor número de cámaras que alcanza una cobertura objetivo
+import math
+import random
+import time
+from estado import EstadoCamaras
+from inicializacion import InicializadorVoraz
+from telemetria import Telemetria, TELEMETRIA_NULA
+
+
+class TelemetriaEjecucion(Telemetria):
+    """Telemetría de una búsqueda interna del minimizador (no publica eventos).
+
+    Detiene la búsqueda en cuanto el mejor área llega al objetivo, cuando
+    lleva ``paciencia`` evaluaciones sin mejorar (no va a llegar) o cuando
+    se detiene la telemetría ``externa``. ``parada`` indica cuál de ellas fue.
+    """
+    def __init__(self, objetivo, paciencia=None, externa=TELEMETRIA_NULA):
+        super().__init__(intervalo=math.inf, objetivo=objetivo)
+        self.paciencia = paciencia
+        self.externa = externa
+        self.parada = None
+        self._mejor = -math.inf
+        self._evaluaciones_mejora = 0
+
+    def iteracion(self, iteracion, area_actual, mejor_area, evaluaciones, aceptado=None,
+                  temperatura=None):
+        super().iteracion(iteracion, area_actual, mejor_area, evaluaciones, aceptado, temperatura)
+        if mejor_area > self._mejor:
+            self._mejor = mejor_area
+            self._evaluaciones_mejora = evaluaciones
+        if self.parada is not None:
+            return
+        if self.detenida:
+            self.parada = 'objetivo'
+        elif self.paciencia is not None and evaluaciones - self._evaluaciones_mejora >= self.paciencia:
+            self.parada = 'estancada'
+        elif self.externa.detenida:
+            self.parada = 'detenida'
+        self.detenida = self.parada is not None
+
+
+class MinimizadorCamaras:
+    """Menor número de cámaras que cubre la fracción ``objetivo`` de la superficie.
+
+    Empieza en la cota inferior que da ``Museo.area_maxima_camara`` (con
+    menos cámaras es imposible llegar), avanza con saltos que se doblan hasta
+    el primer n que llega y luego bisecciona entre el último que no llegó y
+    ese. Cada n arranca en caliente desde la solución del n resuelto más
+    cercano: quitando las cámaras que menos cubren o añadiendo cámaras de
+    forma voraz. Cada búsqueda interna (``agente``: Hill Climbing o Simulated
+    Annealing, con ``opciones``) se detiene al alcanzar el objetivo o tras
+    ``paciencia`` evaluaciones sin mejorar. Es una búsqueda heurística: que
+    un n no llegue significa que la búsqueda interna no lo consiguió.
+    """
+    def __init__(self, museo, interfaz, objetivo, agente, opciones=None, minimo=1, maximo=None,
+                 paciencia=2000, semilla=None, telemetria=None):
+        if not 0 < objetivo <= 1:
+            raise ValueError("La cobertura objetivo debe estar en (0, 1]")
+        self.museo = museo
+        self.interfaz = interfaz
+        self.objetivo = objetivo
+        self.agente = agente
+        self.opciones = opciones or {}
+        self.minimo = minimo
+        self.maximo = maximo
+        self.paciencia = paciencia
+        self.semilla = semilla
+        self.telemetria = telemetria if telemetria is not None else TELEMETRIA_NULA
+        self.soluciones = {}  # n -> (cámaras, área) de cada búsqueda
+        self.ejecuciones = []
+        self.tiempo_ejecucion = 0
+
+    def buscar(self):
+        """Búsqueda del mínimo: galope desde la cota inferior y bisección"""
+        self.interfaz.log("="*50)
+        self.interfaz.log("🚀 INICIANDO MINIMIZACIÓN DE CÁMARAS...")
+        self.telemetria.inicio("Mínimo de cámaras")
+        inicio = time.time()
+        self.rng = random.Random(self.semilla)
+        self.soluciones = {}
+        self.ejecuciones = []
+        num_camaras = self.museo.num_camaras
+        self.superficie = self.museo.superficie()
+        self.area_objetivo = self.objetivo * self.superficie
+        cota = max(self.minimo, math.ceil(self.area_objetivo / self.museo.area_maxima_camara()))
+        self.interfaz.log(f"🎯 Objetivo: {self.area_objetivo:.1f} de {self.superficie:.1f} "
+                          f"({self.objetivo:.0%}); hacen falta al menos {cota} cámaras")
+
+        bajo, alto = cota - 1, None  # con bajo cámaras no se llega; con alto sí
+        n, salto = cota, 1
+        while alto is None and not self.telemetria.detenida:
+            if self.maximo is not None and n > self.maximo:
+                if bajo >= self.maximo:
+                    break
+                n = self.maximo
+            camaras, area = self._resolver(n)
+            if area >= self.area_objetivo:
+                alto = n
+            elif len(camaras) < n:
+                self.interfaz.log(f"⛔ Solo caben {len(camaras)} cámaras")
+                break
+            else:
+                bajo = n
+                n, salto = n + salto, salto * 2
+
+        while alto is not None and alto - bajo > 1 and not self.telemetria.detenida:
+            n = (bajo + alto) // 2
+            if self._resolver(n)[1] >= self.area_objetivo:
+                alto = n
+            else:
+                bajo = n
+
+        if alto is not None:
+            camaras, area = self.soluciones[alto]
+            self.museo.num_camaras = len(camaras)
+            self.interfaz.log(f"🏁 FIN MINIMIZACIÓN - {len(camaras)} cámaras: {area:.1f} "
+                              f"({area / self.superficie:.1%})")
+        else:
+            camaras, area = max(self.soluciones.values(), key=lambda s: s[1],
+                                default=([], 0))
+            self.museo.num_camaras = num_camaras
+            self.interfaz.log("🏁 FIN MINIMIZACIÓN - Ningún número de cámaras alcanza el objetivo")
+        self.museo.camaras = EstadoCamaras(camaras)
+        self.interfaz.actualizar_visualizacion()
+        self.tiempo_ejecucion = time.time() - inicio
+
+        resultado = {
+            'algoritmo': 'Mínimo de cámaras',
+            'camaras': len(camaras) if alto is not None else None,
+            'objetivo': self.objetivo,
+            'area_objetivo': self.area_objetivo,
+            'superficie': self.superficie,
+            'cota_inferior': cota,
+            'area': area,
+            'cobertura': area / self.superficie,
+            'tiempo': self.tiempo_ejecucion,
+            'iteraciones': len(self.ejecuciones),
+            'solucion': list(camaras),
+            'evaluaciones': sum(e['evaluaciones'] for e in self.ejecuciones),
+            'ejecuciones': self.ejecuciones
+        }
+        self.telemetria.fin(resultado)
+        return resultado
+
+    def _resolver(self, n):
+        """Búsqueda interna con n cámaras; devuelve (cámaras, área)"""
+        inicio = time.time()
+        semilla = self.rng.getrandbits(64)
+        self.museo.num_camaras = n
+        origen, estado_inicial = self._arranque(n, random.Random(semilla))
+        self.interfaz.log(f"🔢 Probando {n} cámaras"
+                          + (f" (desde {origen})" if origen is not None else ""))
+        telemetria = TelemetriaEjecucion(self.area_objetivo, self.paciencia, self.telemetria)
+        agente = self.agente(self.museo, self.interfaz, semilla=semilla, telemetria=telemetria,
+                             estado_inicial=estado_inicial, **self.opciones)
+        resultado = agente.buscar()
+        camaras, area = resultado['solucion'], resultado['area']
+        self.soluciones[n] = (camaras, area)
+
+        alcanzado = area >= self.area_objetivo
+        self.ejecuciones.append({
+            'camaras': n,
+            'colocadas': len(camaras),
+            'arranque': origen,
+            'area': area,
+            'cobertura': area / self.superficie,
+            'alcanzado': alcanzado,
+            'parada': telemetria.parada,
+            'evaluaciones': resultado['evaluaciones'],
+            'tiempo': time.time() - inicio
+        })
+        self.interfaz.log(f"{'✅' if alcanzado else '❌'} {n} cámaras: {area:.1f} "
+                          f"({area / self.superficie:.1%})")
+        mejor = max(e['area'] for e in self.ejecuciones)
+        self.telemetria.iteracion(len(self.ejecuciones), area, mejor,
+                                  sum(e['evaluaciones'] for e in self.ejecuciones))
+        return camaras, area
+
+    def _arranque(self, n, rng):
+        """(n de origen, estado inicial) desde la solución resuelta más cercana, o (None, None)"""
+        if not self.soluciones:
+            return None, None
+        # Más cercano; a igual distancia, el mayor (recortar conserva una solución buena)
+        origen = min(self.soluciones, key=lambda m: (abs(m - n), -m))
+        camaras = self.soluciones[origen][0]
+        if len(camaras) >= n:
+            return origen, self._recortar(camaras, n)
+        voraz = InicializadorVoraz(self.museo)
+        camaras = voraz.ampliar(camaras, rng)
+        if len(camaras) < n:  # huecos más estrechos que la rejilla de candidatos
+            camaras = voraz.ampliar(camaras, rng, paso=1)
+        if len(camaras) < n:
+            return None, None  # la voraz no encuentra sitio: arranque en frío
+        return origen, camaras
+
+    def _recortar(self, camaras, n):
+        """Quita las cámaras que menos área aportan hasta dejar n.
+
+        Sin solapamientos, lo que aporta cada cámara no depende de las demás,
+        así que basta medirlo una vez.
+        """
+        backend = self.museo.cobertura
+        rejilla = backend.nueva_rejilla()
+        for camara in camaras:
+            backend.sumar(rejilla, camara)
+        aportes = []
+        for camara in camaras:
+            perdidas, _ = backend.restar(rejilla, camara)
+            backend.sumar(rejilla, camara)
+            aportes.append(perdidas)
+        quedan = sorted(range(len(camaras)), key=lambda i: aportes[i], reverse=True)[:n]
+        return [camaras[i] for i in sorted(quedan)]
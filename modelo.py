@@ -1,35 +1,95 @@
 # modelo.py - Clases de datos del museo
+import math
 import random
+import threading
+from cobertura import crear_cobertura, CoberturaReducida, SeguidorCobertura
+from estado import EstadoCamaras
+from inicializacion import crear_inicializador
+from instrumentacion import INSTRUMENTACION_NULA
+
+try:
+    import numpy as np
+except ImportError:  # sin numpy los movimientos se comprueban uno a uno
+    np = None
 
 class Museo:
     """Representa el entorno del museo"""
-    def __init__(self, tamano=120, num_camaras=10, radio_cobertura=15):
+    def __init__(self, tamano=120, num_camaras=10, radio_cobertura=15, cobertura="auto",
+                 inicializacion="poisson", plano=None, vision=False):
+        if plano is not None:
+            tamano = plano.tamano
         self.tamano = tamano
         self.num_camaras = num_camaras
         self.radio = radio_cobertura
         self.camaras = []
         self.solapamientos = 0
+        self.plano = plano
+        self.vision = vision
+        self.cobertura = crear_cobertura(cobertura, tamano, radio_cobertura, plano, vision)
+        self._reducidas = {}
+        self.inicializador = crear_inicializador(inicializacion, self)
+        self.instrumentacion = INSTRUMENTACION_NULA
         
     def calcular_area_cubierta(self):
         """Heurística: área cubierta sin solapamientos"""
-        puntos_cubiertos = set()
-        self.solapamientos = 0
-        
-        for camara in self.camaras:
-            x, y = camara
-            for i in range(max(0, int(x - self.radio)), min(self.tamano, int(x + self.radio)) + 1):
-                for j in range(max(0, int(y - self.radio)), min(self.tamano, int(y + self.radio)) + 1):
-                    if math.sqrt((i - x)**2 + (j - y)**2) <= self.radio:
-                        punto = (i, j)
-                        if punto in puntos_cubiertos:
-                            self.solapamientos += 1
-                        puntos_cubiertos.add(punto)
-        
-        return len(puntos_cubiertos)
+        with self.instrumentacion.fase('evaluacion'):
+            cubiertos, self.solapamientos = self.cobertura.calcular(self.camaras)
+        self.instrumentacion.contar('evaluaciones_completas')
+        return cubiertos
+
+    def superficie(self):
+        """Área total del suelo en las unidades del backend (puntos de rejilla o m²)"""
+        if self.cobertura.nombre == "exacto":
+            return self.tamano ** 2
+        if self.plano is not None:
+            return sum(self.plano.validas)
+        return (self.tamano + 1) ** 2
+
+    def area_maxima_camara(self):
+        """Cota superior del área que cubre una cámara, esté donde esté.
+
+        Los discos no se solapan, así que n cámaras cubren como mucho n veces
+        esto. En rejilla, cada punto cubierto aporta un cuadrado unidad que
+        cae dentro del disco de radio r + √2/2.
+        """
+        if self.cobertura.nombre == "exacto":
+            return math.pi * self.radio ** 2
+        return math.pi * (self.radio + math.sqrt(2) / 2) ** 2
+
+    def generar_estado_inicial(self, rng):
+        """Estado inicial válido (``EstadoCamaras``) con la estrategia configurada"""
+        with self.instrumentacion.fase('inicializacion'):
+            return EstadoCamaras(self.inicializador.generar(rng))
+
+    def crear_seguidor(self, estado, factor=1):
+        """Seguidor incremental de cobertura para movimientos de una cámara.
+
+        Con ``factor`` > 1 evalúa sobre la rejilla submuestreada de ese paso.
+        """
+        return SeguidorCobertura(self.cobertura_reducida(factor), estado)
+
+    def cobertura_reducida(self, factor):
+        """Backend de cobertura sobre una rejilla de paso ``factor`` (se crea una vez)"""
+        if factor == 1:
+            return self.cobertura
+        if factor not in self._reducidas:
+            plano = self.plano.escalado(factor) if self.plano is not None else None
+            backend = crear_cobertura(self.cobertura.nombre, self.tamano // factor,
+                                      self.radio / factor, plano, self.vision)
+            self._reducidas[factor] = CoberturaReducida(backend, factor)
+        return self._reducidas[factor]
+
+    def crear_indice(self, estado=()):
+        """Índice espacial para comprobar solapamientos en O(1)"""
+        if self.instrumentacion.activa:
+            return IndiceEspacialMedido(self, estado)
+        return IndiceEspacial(self, estado)
 
     def es_valido(self, posicion):
-        """Verifica si una posición está dentro del museo"""
+        """Verifica si una posición está dentro del museo (y en zona libre del plano)"""
         x, y = posicion
+        if self.plano is not None:
+            return self.plano.valida(x, y)
         return 0 <= x <= self.tamano and 0 <= y <= self.tamano
 
     def hay_solapamiento(self, pos1, pos2):
@@ -37,44 +97,195 @@ class Museo:
         dist = math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
         return dist < self.radio * 2
 
+    def generar_movimientos(self, estado, indice=None, paso=5):
+        """Movimientos válidos (indice_camara, nueva_pos) para búsqueda local"""
+        if indice is None:
+            indice = self.crear_indice(estado)
+        movimientos = []
+        with self.instrumentacion.fase('vecinos'):
+            for i in range(len(estado)):
+                for dx, dy in [(paso,0), (-paso,0), (0,paso), (0,-paso)]:
+                    nueva_pos = (estado[i][0] + dx, estado[i][1] + dy)
+                    # Verificar restricciones
+                    if self.es_valido(nueva_pos) and not indice.hay_conflicto(nueva_pos, excepto=i):
+                        movimientos.append((i, nueva_pos))
+        self.instrumentacion.contar('vecinos_factibles', len(movimientos))
+        self.instrumentacion.contar('vecinos_infactibles', 4 * len(estado) - len(movimientos))
+        return movimientos
+
+    def movimientos_lote(self, estado, paso=5):
+        """Movimientos factibles como listas paralelas (indices, dx, dy), sin copiar estados.
+
+        Mismo orden y criterio que ``generar_movimientos``, pero los límites,
+        el plano y los solapamientos se comprueban para todos los movimientos
+        a la vez, solo entre cámaras de celdas vecinas (``pares_cercanos``).
+        """
+        if np is None or not estado:
+            movimientos = self.generar_movimientos(estado, paso=paso)
+            return ([i for i, _ in movimientos],
+                    [pos[0] - estado[i][0] for i, pos in movimientos],
+                    [pos[1] - estado[i][1] for i, pos in movimientos])
+        
+        with self.instrumentacion.fase('vecinos'):
+            posiciones = np.asarray(estado, dtype=float)
+            n = len(estado)
+            indices = np.repeat(np.arange(n), 4)
+            desplazamientos = np.tile(np.array([(paso, 0), (-paso, 0), (0, paso), (0, -paso)]), (n, 1))
+            destinos = posiciones[indices] + desplazamientos
+            
+            if self.plano is None:
+                factible = ((destinos >= 0) & (destinos <= self.tamano)).all(axis=1)
+            else:
+                celdas = np.rint(destinos).astype(np.int64)
+                factible = ((celdas >= 0) & (celdas <= self.plano.tamano)).all(axis=1)
+                celdas = np.clip(celdas, 0, self.plano.tamano)
+                factible &= self.plano.validas_numpy()[celdas[:, 0], celdas[:, 1]]
+            
+            # Solapamientos: solo pueden chocar cámaras a menos de 2·radio + paso
+            a, b = pares_cercanos(posiciones, self.radio * 2 + abs(paso))
+            if len(a):
+                movidas = posiciones[a][:, None, :] + desplazamientos[None, :4, :]
+                choca = ((movidas - posiciones[b][:, None, :])**2).sum(axis=2) < (self.radio * 2)**2
+                conflictos = np.stack([np.bincount(a, weights=choca[:, k], minlength=n) > 0
+                                       for k in range(4)], axis=1)
+                factible &= ~conflictos.ravel()
+        
+        self.instrumentacion.contar('vecinos_factibles', int(factible.sum()))
+        self.instrumentacion.contar('vecinos_infactibles', int((~factible).sum()))
+        return (indices[factible].tolist(), desplazamientos[factible, 0].tolist(),
+                desplazamientos[factible, 1].tolist())
+
     def generar_vecinos(self, estado):
         """Sucesores para búsqueda local"""
         vecinos = []
-        for i in range(len(estado)):
-            for dx, dy in [(5,0), (-5,0), (0,5), (0,-5)]:
-                nueva_pos = (estado[i][0] + dx, estado[i][1] + dy)
-                if self.es_valido(nueva_pos):
-                    nuevo_estado = estado.copy()
-                    nuevo_estado[i] = nueva_pos
-                    
-                    # Verificar restricciones
-                    solapa = False
-                    for j, pos in enumerate(nuevo_estado):
-                        if i != j and self.hay_solapamiento(pos, nuevo_estado[i]):
-                            solapa = True
-                            break
-                    
-                    if not solapa:
-                        vecinos.append(nuevo_estado)
+        for i, nueva_pos in self.generar_movimientos(estado):
+            nuevo_estado = estado.copy()
+            nuevo_estado[i] = nueva_pos
+            vecinos.append(nuevo_estado)
         return vecinos
 
 
+def pares_cercanos(posiciones, distancia):
+    """Pares (a, b), a ≠ b, de filas de ``posiciones`` (n, 2) a ``distancia`` o menos.
+
+    Versión en lote de ``IndiceEspacial``: agrupa las cámaras en celdas de
+    lado ``distancia`` (ordenando por celda) y solo compara cada una con las
+    de su celda y las 8 adyacentes, en vez de calcular las n² distancias.
+    """
+    n = len(posiciones)
+    celdas = np.floor(posiciones / distancia).astype(np.int64)
+    celdas -= celdas.min(axis=0) - 1  # margen de una celda para los vecinos
+    ancho = int(celdas[:, 1].max()) + 2
+    claves = celdas[:, 0] * ancho + celdas[:, 1]
+    orden = np.argsort(claves, kind='stable')
+    ordenadas = claves[orden]
+    pares_a, pares_b = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            vecinas = claves + dx * ancho + dy
+            inicio = np.searchsorted(ordenadas, vecinas, 'left')
+            cuenta = np.searchsorted(ordenadas, vecinas, 'right') - inicio
+            total = int(cuenta.sum())
+            if not total:
+                continue
+            # Posición de cada par dentro del tramo de la celda vecina
+            desfase = np.arange(total) - np.repeat(np.cumsum(cuenta) - cuenta, cuenta)
+            pares_a.append(np.repeat(np.arange(n), cuenta))
+            pares_b.append(orden[np.repeat(inicio, cuenta) + desfase])
+    if not pares_a:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    a, b = np.concatenate(pares_a), np.concatenate(pares_b)
+    cerca = (a != b) & (((posiciones[a] - posiciones[b])**2).sum(axis=1) <= distancia**2)
+    return a[cerca], b[cerca]
+
+
+class IndiceEspacial:
+    """Rejilla uniforme de celda 2·radio con las cámaras por identificador.
+
+    Dos cámaras solo pueden solaparse si están en la misma celda o en una
+    adyacente, así que cada consulta revisa 9 celdas en vez de todas las
+    cámaras, y mover una cámara cuesta O(1).
+    """
+    def __init__(self, museo, camaras=()):
+        self.museo = museo
+        self.lado = museo.radio * 2
+        self.posiciones = {}
+        self.celdas = {}
+        for i, posicion in enumerate(camaras):
+            self.agregar(i, posicion)
+
+    def _celda(self, posicion):
+        return (math.floor(posicion[0] / self.lado), math.floor(posicion[1] / self.lado))
+
+    def agregar(self, i, posicion):
+        self.posiciones[i] = posicion
+        self.celdas.setdefault(self._celda(posicion), set()).add(i)
+
+    def quitar(self, i):
+        celda = self._celda(self.posiciones.pop(i))
+        self.celdas[celda].discard(i)
+        if not self.celdas[celda]:
+            del self.celdas[celda]
+
+    def mover(self, i, posicion):
+        if self._celda(self.posiciones[i]) == self._celda(posicion):
+            self.posiciones[i] = posicion
+        else:
+            self.quitar(i)
+            self.agregar(i, posicion)
+
+    def hay_conflicto(self, posicion, excepto=None):
+        """¿Solapa ``posicion`` con alguna cámara distinta de ``excepto``?"""
+        cx, cy = self._celda(posicion)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in self.celdas.get((cx + dx, cy + dy), ()):
+                    if j != excepto and self.museo.hay_solapamiento(self.posiciones[j], posicion):
+                        return True
+        return False
+
+
+class IndiceEspacialMedido(IndiceEspacial):
+    """Índice espacial que registra las comprobaciones en la instrumentación del museo"""
+    def hay_conflicto(self, posicion, excepto=None):
+        instr = self.museo.instrumentacion
+        instr.contar('comprobaciones_solapamiento')
+        with instr.fase('solapamiento'):
+            return super().hay_conflicto(posicion, excepto)
+
+
 class VelocidadControl:
     """Control de velocidad de animación (patrón de diseño)"""
     def __init__(self):
         self.delay = 0.5
         self.pausado = False
+        self._reanudado = threading.Event()
+        self._reanudado.set()
     
     def sleep(self):
+        """Espera el retardo de animación; mientras esté en pausa, bloquea"""
         import time
-        if not self.pausado:
+        self._reanudado.wait()
+        if self.delay > 0:
             time.sleep(self.delay)
     
     def pausar(self):
         self.pausado = True
+        self._reanudado.clear()
     
     def reanudar(self):
         self.pausado = False
+        self._reanudado.set()
     
     def set_delay(self, value):
-        self.delay = value
\ No newline at end of file
+        self.delay = value
+
+
+class VelocidadNula(VelocidadControl):
+    """Control de velocidad sin esperas (ejecución sin interfaz gráfica)"""
+    def __init__(self):
+        super().__init__()
+        self.delay = 0
+    
+    def sleep(self):
+        pass
\ No newline at end of file
@@ -0,0 +1,168 @@
+# plano.py - Planos de planta: contorno poligonal, obstáculos y máscaras precalculadas
+import json
+import math
+
+try:
+    import numpy as np
+except ImportError:  # sin numpy la visibilidad se comprueba punto a punto
+    np = None
+
+
+def _orientacion(ax, ay, bx, by, cx, cy):
+    """Signo del giro a → b → c (positivo en sentido antihorario)"""
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+class Plano:
+    """Contorno del edificio y obstáculos (salas, muros, vitrinas...) como polígonos.
+
+    Al construirlo se rasteriza una máscara de validez sobre los puntos
+    enteros 0..tamano (dentro del contorno y fuera de todo obstáculo), de
+    modo que ``valida`` es O(1). Los lados de todos los polígonos son los
+    muros que cortan la línea de visión.
+    """
+    def __init__(self, contorno, obstaculos=()):
+        self.contorno = [tuple(p) for p in contorno]
+        self.obstaculos = [[tuple(p) for p in obstaculo] for obstaculo in obstaculos]
+        for poligono in [self.contorno] + self.obstaculos:
+            if len(poligono) < 3:
+                raise ValueError("Cada polígono del plano necesita al menos 3 vértices")
+            if min(min(x, y) for x, y in poligono) < 0:
+                raise ValueError("Las coordenadas del plano deben ser no negativas")
+
+        self.tamano = math.ceil(max(max(x, y) for x, y in self.contorno))
+        self.muros = [(a, b) for poligono in [self.contorno] + self.obstaculos
+                      for a, b in zip(poligono, poligono[1:] + poligono[:1])]
+        self.validas = self._rasterizar()
+        self._validas_numpy = None
+
+    def escalado(self, factor):
+        """Mismo plano con las coordenadas divididas por ``factor`` (rejillas submuestreadas)"""
+        return Plano([(x / factor, y / factor) for x, y in self.contorno],
+                     [[(x / factor, y / factor) for x, y in obstaculo] for obstaculo in self.obstaculos])
+
+    @staticmethod
+    def _tramos(poligono, y):
+        """Intervalos [x0, x1] de la fila ``y`` dentro del polígono (bordes incluidos)"""
+        cortes = []
+        tramos = []
+        for (x1, y1), (x2, y2) in zip(poligono, poligono[1:] + poligono[:1]):
+            if y1 == y2:
+                if y1 == y:  # lado horizontal sobre la fila
+                    tramos.append((min(x1, x2), max(x1, x2)))
+            elif min(y1, y2) <= y < max(y1, y2):
+                cortes.append(x1 + (y - y1) * (x2 - x1) / (y2 - y1))
+        cortes.sort()
+        tramos.extend(zip(cortes[::2], cortes[1::2]))
+        return tramos
+
+    def _rasterizar(self):
+        """Máscara (bytearray, índice x·(tamano+1) + y) de puntos válidos"""
+        n = self.tamano + 1
+        validas = bytearray(n * n)
+        for valor, poligonos in ((1, [self.contorno]), (0, self.obstaculos)):
+            for poligono in poligonos:
+                for y in range(n):
+                    for x0, x1 in self._tramos(poligono, y):
+                        i0, i1 = max(0, math.ceil(x0)), min(n - 1, math.floor(x1))
+                        if i0 <= i1:
+                            validas[i0 * n + y:i1 * n + y + 1:n] = bytes([valor]) * (i1 - i0 + 1)
+        return validas
+
+    def valida(self, x, y):
+        """¿El punto (redondeado a la rejilla) está dentro y fuera de obstáculos?"""
+        i, j = round(x), round(y)
+        if not (0 <= i <= self.tamano and 0 <= j <= self.tamano):
+            return False
+        return self.validas[i * (self.tamano + 1) + j] == 1
+
+    def validas_numpy(self):
+        """Vista booleana (tamano+1)² de la máscara, indexada [x, y]"""
+        if self._validas_numpy is None:
+            n = self.tamano + 1
+            self._validas_numpy = np.frombuffer(bytes(self.validas), dtype=np.uint8).reshape(n, n) == 1
+        return self._validas_numpy
+
+    def muros_en(self, x0, y0, x1, y1):
+        """Muros cuya caja envolvente toca el rectángulo [x0, x1] × [y0, y1]"""
+        return [((ax, ay), (bx, by)) for (ax, ay), (bx, by) in self.muros
+                if min(ax, bx) <= x1 and max(ax, bx) >= x0 and min(ay, by) <= y1 and max(ay, by) >= y0]
+
+    def visible(self, origen, destino, muros=None):
+        """¿El segmento origen → destino no atraviesa ningún muro?
+
+        ``muros`` restringe la comprobación (p. ej. a ``muros_en`` de una caja
+        que contenga el segmento).
+        """
+        ox, oy = origen
+        dx, dy = destino
+        for (ax, ay), (bx, by) in (self.muros if muros is None else muros):
+            if (_orientacion(ax, ay, bx, by, ox, oy) * _orientacion(ax, ay, bx, by, dx, dy) < 0 and
+                    _orientacion(ox, oy, dx, dy, ax, ay) * _orientacion(ox, oy, dx, dy, bx, by) < 0):
+                return False
+        return True
+
+    def visibles(self, origen, xs, ys):
+        """Versión vectorizada de ``visible`` para los destinos (xs, ys) (arrays numpy)"""
+        muros = np.array([(ax, ay, bx, by) for (ax, ay), (bx, by) in self.muros], dtype=float)
+        ax, ay, bx, by = (muros[:, k] for k in range(4))
+        ox, oy = origen
+        xs = xs.astype(float)[:, None]
+        ys = ys.astype(float)[:, None]
+        o1 = _orientacion(ax, ay, bx, by, ox, oy)
+        o2 = _orientacion(ax, ay, bx, by, xs, ys)
+        o3 = _orientacion(ox, oy, xs, ys, ax, ay)
+        o4 = _orientacion(ox, oy, xs, ys, bx, by)
+        return ~np.any((o1 * o2 < 0) & (o3 * o4 < 0), axis=1)
+
+
+def _anillo(coordenadas):
+    """Anillo GeoJSON sin el vértice de cierre repetido"""
+    puntos = [tuple(p[:2]) for p in coordenadas]
+    if len(puntos) > 1 and puntos[0] == puntos[-1]:
+        puntos.pop()
+    return puntos
+
+
+def plano_desde_json(datos):
+    """Construye un ``Plano`` desde el formato simple o desde GeoJSON.
+
+    Formato simple: ``{"contorno": [[x, y], ...], "obstaculos": [[[x, y], ...], ...]}``.
+    GeoJSON: un Polygon (anillo exterior = contorno, huecos = obstáculos), un
+    Feature o una FeatureCollection donde los Feature con propiedad
+    ``"tipo": "obstaculo"`` son obstáculos y el resto aporta el contorno.
+    """
+    if "contorno" in datos:
+        return Plano(datos["contorno"], datos.get("obstaculos", ()))
+
+    tipo = datos.get("type")
+    if tipo == "FeatureCollection":
+        elementos = datos["features"]
+    elif tipo == "Feature":
+        elementos = [datos]
+    elif tipo == "Polygon":
+        elementos = [{"geometry": datos, "properties": {}}]
+    else:
+        raise ValueError(f"Formato de plano no reconocido: {tipo!r}")
+
+    contornos, obstaculos = [], []
+    for elemento in elementos:
+        geometria = elemento.get("geometry") or {}
+        if geometria.get("type") != "Polygon":
+            raise ValueError(f"Solo se admiten polígonos (encontrado {geometria.get('type')!r})")
+        anillos = [_anillo(anillo) for anillo in geometria["coordinates"]]
+        if (elemento.get("properties") or {}).get("tipo") == "obstaculo":
+            obstaculos.extend(anillos)
+        else:
+            contornos.append(anillos[0])
+            obstaculos.extend(anillos[1:])
+
+    if len(contornos) != 1:
+        raise ValueError(f"El plano debe tener exactamente un contorno (hay {len(contornos)})")
+    return Plano(contornos[0], obstaculos)
+
+
+def cargar_plano(ruta):
+    """Lee un plano JSON/GeoJSON de disco"""
+    with open(ruta, encoding="utf-8") as f:
+        return plano_desde_json(json.load(f))
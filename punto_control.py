@@ -0,0 +1,51 @@
+# punto_control.py - Guardado periódico del estado de búsqueda para poder reanudarla
+import os
+import pickle
+import time
+
+
+class PuntoControl:
+    """Fichero de punto de control y cuándo toca escribirlo.
+
+    Se escribe cada ``cada_iteraciones`` llamadas a ``toca`` o cada
+    ``cada_segundos``, lo que llegue antes (por defecto cada 1000
+    iteraciones). La escritura es atómica (fichero temporal + ``os.replace``):
+    si el proceso muere a mitad, queda el punto de control anterior.
+    """
+    VERSION = 1
+
+    def __init__(self, ruta, cada_iteraciones=None, cada_segundos=None):
+        if cada_iteraciones is None and cada_segundos is None:
+            cada_iteraciones = 1000
+        self.ruta = ruta
+        self.cada_iteraciones = cada_iteraciones
+        self.cada_segundos = cada_segundos
+        self.escrituras = 0
+        self._iteraciones = 0
+        self._ultimo = time.monotonic()
+
+    def toca(self):
+        """Cuenta una iteración; True si ya toca escribir"""
+        self._iteraciones += 1
+        if self.cada_iteraciones is not None and self._iteraciones >= self.cada_iteraciones:
+            return True
+        return self.cada_segundos is not None and time.monotonic() - self._ultimo >= self.cada_segundos
+
+    def guardar(self, datos):
+        temporal = f"{self.ruta}.tmp"
+        with open(temporal, "wb") as f:
+            pickle.dump({'version': self.VERSION, 'datos': datos}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, self.ruta)
+        self.escrituras += 1
+        self._iteraciones = 0
+        self._ultimo = time.monotonic()
+
+    def cargar(self):
+        """Datos del último punto de control, o None si aún no hay fichero"""
+        if not os.path.exists(self.ruta):
+            return None
+        with open(self.ruta, "rb") as f:
+            contenido = pickle.load(f)
+        if contenido.get('version') != self.VERSION:
+            raise ValueError(f"Versión de punto de control no admitida en {self.ruta!r}")
+        return contenido['datos']
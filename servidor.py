@@ -0,0 +1,399 @@
+# servidor.py - Servidor local de trabajos de optimización: API HTTP/JSON sobre asyncio
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from agentes import InterfazNula, crear_agente, crear_parser, validar_opciones
+from plano import plano_desde_json
+from telemetria import Telemetria
+
+# Opciones de la línea de comandos que escriben o leen ficheros del servidor o su salida
+OPCIONES_LOCALES = {'profile', 'checkpoint', 'checkpoint_every', 'checkpoint_seconds', 'resume',
+                    'events', 'events_interval', 'verbose', 'help'}
+LIMITE_CUERPO = 1 << 20
+ESTADOS_HTTP = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed"}
+
+
+def _rechazar(mensaje):
+    raise ValueError(mensaje)
+
+
+def _salir(estado=0, mensaje=None):
+    # argparse termina el proceso con exit() (p. ej. --help): en el servidor es un error del trabajo
+    raise ValueError(mensaje.strip() if mensaje else "Especificación no válida")
+
+
+def analizar_trabajo(spec):
+    """Opciones (``argparse.Namespace``) de un trabajo descrito en JSON.
+
+    Las claves son las opciones de ``python -m agentes`` sin los guiones
+    iniciales (``algo``, ``cameras``, ``size``, ``radius``, ``seed``,
+    ``schedule``...); ``true`` activa un interruptor. ``plan`` lleva el
+    contenido del plano (JSON o GeoJSON), nunca una ruta del servidor. Lanza
+    ValueError si la especificación no es válida.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("El trabajo debe ser un objeto JSON")
+    argv = []
+    plano = None
+    for clave, valor in spec.items():
+        nombre = clave.lstrip('-').replace('-', '_')
+        if nombre in OPCIONES_LOCALES:
+            raise ValueError(f"Opción no admitida en el servidor: {clave!r}")
+        if nombre == 'plan':
+            if not isinstance(valor, dict):
+                raise ValueError("'plan' debe ser el plano como objeto JSON, no una ruta")
+            plano = valor
+            continue
+        if valor is None or valor is False:
+            continue
+        argv.append('--' + nombre.replace('_', '-'))
+        if valor is not True:
+            argv.append(str(valor))
+    parser = crear_parser()
+    parser.allow_abbrev = False  # 'pro' o 'check' no deben colarse como --profile o --checkpoint
+    parser.error = _rechazar
+    parser.exit = _salir
+    args = parser.parse_args(argv)
+    validar_opciones(args)
+    if plano is not None:
+        try:
+            plano_desde_json(plano)
+        except (KeyError, TypeError, IndexError) as e:
+            raise ValueError(f"Plano no válido: {e!r}")
+        args.plan = plano
+    return args
+
+
+def _reenviar(id_trabajo, suscripcion, telemetria, cola, parar):
+    """Hilo del proceso trabajador: progreso a la cola del servidor y peticiones de parada"""
+    while True:
+        if parar.is_set():
+            telemetria.detener()
+        evento = suscripcion.siguiente(0.2)
+        if evento is None:
+            if suscripcion.cerrada:
+                return
+        elif evento['tipo'] == 'progreso':
+            cola.put((id_trabajo, evento))
+        elif evento['tipo'] == 'fin':
+            return
+
+
+def _ejecutar_trabajo(id_trabajo, args, cola, parar, intervalo):
+    """Ejecuta un trabajo sin interfaz en un proceso del pool"""
+    cola.put((id_trabajo, {'tipo': 'inicio'}))
+    telemetria = Telemetria(intervalo=intervalo, objetivo=args.target)
+    suscripcion = telemetria.suscribir(capacidad=10)
+    reenvio = threading.Thread(target=_reenviar, daemon=True,
+                               args=(id_trabajo, suscripcion, telemetria, cola, parar))
+    reenvio.start()
+    try:
+        return crear_agente(args, InterfazNula(), telemetria).buscar()
+    finally:
+        suscripcion.cerrar()
+        reenvio.join()
+
+
+class Trabajo:
+    """Un escenario enviado al servidor, su estado y quién sigue su progreso"""
+    def __init__(self, id_trabajo, clave, args):
+        self.id = id_trabajo
+        self.clave = clave
+        self.args = args
+        self.estado = 'pendiente'  # pendiente, ejecutando, terminado, cancelado o error
+        self.envios = 1  # peticiones atendidas por este trabajo (duplicados incluidos)
+        self.progreso = None  # último evento de progreso
+        self.resultado = None
+        self.error = None
+        self.detenido = False
+        self.oyentes = set()  # asyncio.Queue de los clientes que siguen los eventos
+        self.futuro = None
+        self.parar = None
+
+    @property
+    def terminado(self):
+        return self.estado in ('terminado', 'cancelado', 'error')
+
+    def resumen(self, resultado=False):
+        datos = {'id': self.id, 'estado': self.estado, 'detenido': self.detenido, 'envios': self.envios,
+                 'algoritmo': self.args.algo, 'progreso': self.progreso, 'error': self.error}
+        if resultado:
+            datos['resultado'] = self.resultado
+        return datos
+
+    def evento_final(self):
+        return {'tipo': 'fin', 'id': self.id, 'estado': self.estado, 'detenido': self.detenido,
+                'resultado': self.resultado, 'error': self.error}
+
+
+class ServidorTrabajos:
+    """Cola de trabajos sobre un pool de procesos con caché de resultados.
+
+    Dos envíos con la misma especificación (tras normalizar las opciones)
+    comparten ejecución y resultado mientras el trabajo siga en la caché,
+    que recuerda como mucho ``capacidad`` trabajos terminados. El progreso
+    llega de los procesos por una cola compartida cada ``intervalo``
+    segundos y se reparte a los oyentes; si un oyente no da abasto se
+    descartan sus eventos más antiguos, nunca se frena la búsqueda.
+    """
+    def __init__(self, trabajadores=None, capacidad=1000, intervalo=0.5, cola_oyente=50):
+        self.trabajadores = trabajadores
+        self.capacidad = capacidad
+        self.intervalo = intervalo
+        self.cola_oyente = cola_oyente
+        self.trabajos = {}  # id -> Trabajo
+        self._por_clave = OrderedDict()  # especificación normalizada -> Trabajo
+        self._ids = itertools.count(1)
+        self._pool = None
+
+    def iniciar(self):
+        """Arranca el pool y el hilo que recoge el progreso (dentro del bucle de eventos)"""
+        self._bucle = asyncio.get_running_loop()
+        # forkserver: los procesos se crean bajo demanda dentro de un manejador y, con
+        # fork, heredarían el socket del cliente y su respuesta nunca se cerraría
+        contexto = multiprocessing.get_context('forkserver')
+        self._gestor = contexto.Manager()
+        self._cola = self._gestor.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=self.trabajadores, mp_context=contexto)
+        self._lector = threading.Thread(target=self._leer_progreso, daemon=True)
+        self._lector.start()
+
+    def cerrar(self):
+        if self._pool is None:
+            return
+        for trabajo in self.trabajos.values():
+            if trabajo.parar is not None:
+                trabajo.parar.set()
+        self._pool.shutdown(cancel_futures=True)
+        self._cola.put(None)
+        self._lector.join()
+        self._gestor.shutdown()
+        self._pool = None
+
+    def enviar(self, spec):
+        """Encola un trabajo; devuelve (trabajo, duplicado). ValueError si no es válido"""
+        args = analizar_trabajo(spec)
+        clave = json.dumps(vars(args), sort_keys=True, default=str)
+        trabajo = self._por_clave.get(clave)
+        if trabajo is not None and trabajo.estado not in ('cancelado', 'error') and not trabajo.detenido:
+            trabajo.envios += 1
+            self._por_clave.move_to_end(clave)
+            return trabajo, True
+        if trabajo is not None:
+            del self.trabajos[trabajo.id]  # cancelado, detenido o fallido: lo sustituye el nuevo
+
+        trabajo = Trabajo(str(next(self._ids)), clave, args)
+        trabajo.parar = self._gestor.Event()
+        trabajo.futuro = self._pool.submit(_ejecutar_trabajo, trabajo.id, args, self._cola,
+                                           trabajo.parar, self.intervalo)
+        trabajo.futuro.add_done_callback(
+            lambda futuro: self._bucle.call_soon_threadsafe(self._terminar, trabajo, futuro))
+        self.trabajos[trabajo.id] = trabajo
+        self._por_clave[clave] = trabajo
+        self._olvidar_antiguos()
+        return trabajo, False
+
+    def cancelar(self, trabajo):
+        """Cancela un trabajo pendiente o detiene uno en curso (conserva su mejor solución)"""
+        if trabajo.terminado:
+            return
+        trabajo.detenido = True
+        if not trabajo.futuro.cancel():
+            trabajo.parar.set()
+
+    def _olvidar_antiguos(self):
+        terminados = [t for t in self._por_clave.values() if t.terminado]
+        for trabajo in terminados[:max(0, len(terminados) - self.capacidad)]:
+            del self._por_clave[trabajo.clave]
+            del self.trabajos[trabajo.id]
+
+    def _leer_progreso(self):
+        while True:
+            mensaje = self._cola.get()
+            if mensaje is None:
+                return
+            self._bucle.call_soon_threadsafe(self._progreso, *mensaje)
+
+    def _progreso(self, id_trabajo, evento):
+        trabajo = self.trabajos.get(id_trabajo)
+        if trabajo is None or trabajo.terminado:  # el resultado puede adelantarse al progreso
+            return
+        if evento['tipo'] == 'inicio':
+            trabajo.estado = 'ejecutando'
+        else:
+            trabajo.progreso = evento
+        self._difundir(trabajo, dict(evento, id=trabajo.id))
+
+    def _terminar(self, trabajo, futuro):
+        if futuro.cancelled():
+            trabajo.estado = 'cancelado'
+        else:
+            try:
+                trabajo.resultado = futuro.result()
+                trabajo.estado = 'terminado'
+            except Exception as e:
+                trabajo.estado = 'error'
+                trabajo.error = repr(e)
+        self._difundir(trabajo, trabajo.evento_final())
+        self._olvidar_antiguos()
+
+    def _difundir(self, trabajo, evento):
+        for cola in trabajo.oyentes:
+            if cola.full():
+                cola.get_nowait()
+            cola.put_nowait(evento)
+
+    async def eventos(self, trabajo):
+        """Eventos del trabajo desde ahora hasta el final ('fin' con el resultado)"""
+        if trabajo.terminado:
+            yield trabajo.evento_final()
+            return
+        cola = asyncio.Queue(self.cola_oyente)
+        trabajo.oyentes.add(cola)
+        try:
+            if trabajo.progreso is not None:
+                yield dict(trabajo.progreso, id=trabajo.id)
+            while True:
+                evento = await cola.get()
+                yield evento
+                if evento['tipo'] == 'fin':
+                    return
+        finally:
+            trabajo.oyentes.discard(cola)
+
+    async def atender(self, lector, escritor):
+        """Una petición HTTP/1.1 por conexión"""
+        try:
+            try:
+                metodo, ruta, cuerpo = await _leer_peticion(lector)
+            except (ValueError, asyncio.IncompleteReadError) as e:
+                await _responder(escritor, 400, {'error': f"Petición mal formada: {e}"})
+                return
+            partes = [p for p in ruta.split('?')[0].split('/') if p]
+            if not partes or partes[0] != 'trabajos' or len(partes) > 3:
+                await _responder(escritor, 404, {'error': f"Ruta desconocida: {ruta}"})
+                return
+
+            if len(partes) == 1:
+                if metodo == 'GET':
+                    await _responder(escritor, 200, [t.resumen() for t in self.trabajos.values()])
+                elif metodo == 'POST':
+                    try:
+                        trabajo, duplicado = self.enviar(json.loads(cuerpo or b'null'))
+                    except ValueError as e:
+                        await _responder(escritor, 400, {'error': str(e)})
+                        return
+                    await _responder(escritor, 202, dict(trabajo.resumen(), duplicado=duplicado))
+                else:
+                    await _responder(escritor, 405, {'error': f"Método no admitido: {metodo}"})
+                return
+
+            trabajo = self.trabajos.get(partes[1])
+            if trabajo is None:
+                await _responder(escritor, 404, {'error': f"Trabajo desconocido: {partes[1]}"})
+            elif len(partes) == 3 and partes[2] == 'eventos' and metodo == 'GET':
+                escritor.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                               b"Connection: close\r\n\r\n")
+                async for evento in self.eventos(trabajo):
+                    escritor.write(json.dumps(evento, ensure_ascii=False).encode() + b"\n")
+                    await escritor.drain()
+            elif len(partes) == 2 and metodo == 'GET':
+                await _responder(escritor, 200, trabajo.resumen(resultado=True))
+            elif len(partes) == 2 and metodo == 'DELETE':
+                self.cancelar(trabajo)
+                await _responder(escritor, 202, trabajo.resumen())
+            else:
+                await _responder(escritor, 404, {'error': f"Ruta desconocida: {ruta}"})
+        except ConnectionError:
+            pass  # el cliente se fue a mitad
+        finally:
+            escritor.close()
+
+    async def servir(self, host="127.0.0.1", puerto=8765, unix=None):
+        """Atiende la API en TCP (o en el socket Unix ``unix``) hasta que se cancele"""
+        self.iniciar()
+        try:
+            if unix is not None:
+                servidor = await asyncio.start_unix_server(self.atender, path=unix)
+            else:
+                servidor = await asyncio.start_server(self.atender, host, puerto)
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            self.cerrar()
+            if unix is not None and os.path.exists(unix):
+                os.remove(unix)
+
+
+async def _leer_peticion(lector):
+    """(método, ruta, cuerpo) de una petición HTTP"""
+    linea = (await lector.readline()).decode('latin-1')
+    metodo, ruta, _ = linea.split(' ', 2)
+    cabeceras = {}
+    while True:
+        linea = await lector.readline()
+        if linea in (b'\r\n', b'\n', b''):
+            break
+        nombre, _, valor = linea.decode('latin-1').partition(':')
+        cabeceras[nombre.strip().lower()] = valor.strip()
+    longitud = int(cabeceras.get('content-length', 0))
+    if longitud > LIMITE_CUERPO:
+        raise ValueError("cuerpo demasiado grande")
+    cuerpo = await lector.readexactly(longitud) if longitud else b''
+    return metodo.upper(), ruta, cuerpo
+
+
+async def _responder(escritor, codigo, datos):
+    cuerpo = json.dumps(datos, ensure_ascii=False).encode()
+    escritor.write(f"HTTP/1.1 {codigo} {ESTADOS_HTTP[codigo]}\r\nContent-Type: application/json\r\n"
+                   f"Content-Length: {len(cuerpo)}\r\nConnection: close\r\n\r\n".encode() + cuerpo)
+    await escritor.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python servidor.py",
+        description="Servidor local de trabajos de optimización (API HTTP/JSON)"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="dirección de escucha")
+    parser.add_argument("--port", type=int, default=8765, help="puerto TCP")
+    parser.add_argument("--unix", metavar="RUTA", default=None,
+                        help="escucha en un socket Unix en vez de TCP")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument("--capacity", type=int, default=1000,
+                        help="trabajos terminados que se recuerdan para deduplicar")
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="segundos entre eventos de progreso de cada trabajo")
+    args = parser.parse_args(argv)
+
+    servidor = ServidorTrabajos(args.workers, args.capacity, args.interval)
+    destino = args.unix if args.unix else f"http://{args.host}:{args.port}"
+    print(f"🛰️ Servidor de trabajos en {destino}", file=sys.stderr)
+    asyncio.run(_servir_hasta_senal(servidor, args))
+
+
+async def _servir_hasta_senal(servidor, args):
+    """Sirve hasta SIGINT/SIGTERM y entonces cierra el pool y sus procesos"""
+    tarea = asyncio.current_task()
+    bucle = asyncio.get_running_loop()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        bucle.add_signal_handler(senal, tarea.cancel)
+    try:
+        await servidor.servir(args.host, args.port, args.unix)
+    except asyncio.CancelledError:
+        print("🛑 Servidor detenido", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
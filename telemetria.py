@@ -0,0 +1,238 @@
+# telemetria.py - Eventos de progreso de la búsqueda para consumidores externos
+import asyncio
+import collections
+import json
+import sys
+import threading
+import time
+
+
+class Suscripcion:
+    """Cola acotada de eventos de un consumidor.
+
+    Con ``bloquear=False`` (por defecto) la búsqueda nunca espera: si la cola
+    está llena se descarta el evento más antiguo y se cuenta en
+    ``descartados``. Con ``bloquear=True`` la búsqueda espera a que el
+    consumidor haga sitio (contrapresión), para sumideros que no deben perder
+    eventos. Se recorre con ``for`` o ``async for`` hasta el evento 'fin' o
+    'error', o hasta que se cierre y no queden eventos.
+    """
+    def __init__(self, capacidad=100, bloquear=False):
+        self.capacidad = capacidad
+        self.bloquear = bloquear
+        self.descartados = 0
+        self.cerrada = False
+        self._eventos = collections.deque()
+        self._condicion = threading.Condition()
+
+    def entregar(self, evento):
+        """Encola un evento (lo llama la telemetría desde el hilo de búsqueda)"""
+        with self._condicion:
+            if self.bloquear:
+                self._condicion.wait_for(lambda: len(self._eventos) < self.capacidad or self.cerrada)
+            elif len(self._eventos) >= self.capacidad:
+                self._eventos.popleft()
+                self.descartados += 1
+            if not self.cerrada:
+                self._eventos.append(evento)
+                self._condicion.notify_all()
+
+    def siguiente(self, espera=None):
+        """Próximo evento, esperando como mucho ``espera`` segundos.
+
+        None si no llega a tiempo o si la suscripción está cerrada y vacía.
+        """
+        with self._condicion:
+            self._condicion.wait_for(lambda: self._eventos or self.cerrada, espera)
+            if not self._eventos:
+                return None
+            evento = self._eventos.popleft()
+            self._condicion.notify_all()
+            return evento
+
+    def cerrar(self):
+        """Deja de recibir eventos y libera a la búsqueda si estaba esperando"""
+        with self._condicion:
+            self.cerrada = True
+            self._condicion.notify_all()
+
+    def __iter__(self):
+        while True:
+            evento = self.siguiente()
+            if evento is None:  # cerrada sin 'fin' (p. ej. la búsqueda falló)
+                return
+            yield evento
+            if evento['tipo'] in ('fin', 'error'):
+                return
+
+    async def __aiter__(self):
+        while True:
+            # Espera corta en un hilo para no bloquear el bucle de eventos
+            evento = await asyncio.to_thread(self.siguiente, 0.1)
+            if evento is None:
+                if self.cerrada:
+                    return
+                continue
+            yield evento
+            if evento['tipo'] in ('fin', 'error'):
+                return
+
+
+class Telemetria:
+    """Publica el progreso de la búsqueda a las suscripciones.
+
+    Los agentes llaman a ``iteracion`` en cada iteración, pero solo se
+    construye y entrega un evento cada ``cada`` iteraciones o, si no se
+    indica, cada ``intervalo`` segundos (muestreo). La tasa de aceptación y
+    las evaluaciones por segundo se miden entre dos eventos. ``detener()``
+    (o alcanzar el área ``objetivo``) pide a los agentes que terminen en la
+    próxima iteración con la mejor solución encontrada.
+    """
+    activa = True
+
+    def __init__(self, cada=None, intervalo=0.1, objetivo=None):
+        self.cada = cada
+        self.intervalo = intervalo
+        self.objetivo = objetivo
+        self.detenida = False
+        self._suscripciones = ()
+        self._lock = threading.Lock()
+        self.inicio(None)
+
+    def suscribir(self, capacidad=100, bloquear=False):
+        suscripcion = Suscripcion(capacidad, bloquear)
+        with self._lock:
+            self._suscripciones += (suscripcion,)
+        return suscripcion
+
+    def detener(self):
+        self.detenida = True
+
+    def publicar(self, evento):
+        """Entrega ``evento`` a todas las suscripciones abiertas"""
+        for suscripcion in self._suscripciones:
+            if suscripcion.cerrada:
+                with self._lock:
+                    self._suscripciones = tuple(s for s in self._suscripciones if s is not suscripcion)
+            else:
+                suscripcion.entregar(evento)
+
+    def inicio(self, algoritmo):
+        """Empieza la búsqueda de ``algoritmo``: reinicia contadores y lo anuncia"""
+        self.algoritmo = algoritmo
+        self._inicio = self._ultimo = time.perf_counter()
+        self._iteraciones = 0
+        self._propuestos = 0
+        self._aceptados = 0
+        self._evaluaciones = 0
+        if algoritmo is not None:
+            self.publicar({'tipo': 'inicio', 'algoritmo': algoritmo})
+
+    def iteracion(self, iteracion, area_actual, mejor_area, evaluaciones, aceptado=None,
+                  temperatura=None):
+        """Registra una iteración (``aceptado`` None si no hubo propuesta factible)"""
+        if self.objetivo is not None and mejor_area >= self.objetivo:
+            self.detenida = True
+        self._iteraciones += 1
+        if aceptado is not None:
+            self._propuestos += 1
+            self._aceptados += aceptado
+        if self.cada is not None and self._iteraciones < self.cada:
+            return
+        ahora = time.perf_counter()
+        if self.cada is None and ahora - self._ultimo < self.intervalo:
+            return
+
+        transcurrido = ahora - self._ultimo
+        evento = {
+            'tipo': 'progreso',
+            'algoritmo': self.algoritmo,
+            'iteracion': iteracion,
+            'area_actual': area_actual,
+            'mejor_area': mejor_area,
+            'temperatura': temperatura,
+            'tasa_aceptacion': self._aceptados / self._propuestos if self._propuestos else None,
+            'evaluaciones': evaluaciones,
+            'eval_por_segundo': (evaluaciones - self._evaluaciones) / transcurrido if transcurrido > 0 else None,
+            'tiempo': ahora - self._inicio
+        }
+        self._ultimo = ahora
+        self._iteraciones = self._propuestos = self._aceptados = 0
+        self._evaluaciones = evaluaciones
+        self.publicar(evento)
+
+    def fin(self, resultado):
+        """Anuncia el resultado final de la búsqueda"""
+        self.publicar({'tipo': 'fin', 'algoritmo': self.algoritmo, 'detenida': self.detenida,
+                       'resultado': resultado})
+
+
+class TelemetriaNula:
+    """Telemetría desactivada: cada gancho cuesta una llamada vacía"""
+    activa = False
+    detenida = False
+
+    def inicio(self, algoritmo):
+        pass
+
+    def iteracion(self, iteracion, area_actual, mejor_area, evaluaciones, aceptado=None,
+                  temperatura=None):
+        pass
+
+    def fin(self, resultado):
+        pass
+
+
+TELEMETRIA_NULA = TelemetriaNula()
+
+
+def _buscar(agente, telemetria):
+    try:
+        agente.buscar()
+    except Exception as e:
+        telemetria.publicar({'tipo': 'error', 'algoritmo': telemetria.algoritmo, 'mensaje': repr(e)})
+
+
+def transmitir(agente, capacidad=100, bloquear=False):
+    """Ejecuta ``agente.buscar()`` en un hilo y devuelve sus eventos según llegan.
+
+    El agente debe tener una ``Telemetria``. Si el consumidor deja de
+    iterar antes del final, la búsqueda se detiene.
+    """
+    telemetria = agente.telemetria
+    suscripcion = telemetria.suscribir(capacidad, bloquear)
+    hilo = threading.Thread(target=_buscar, args=(agente, telemetria), daemon=True)
+    hilo.start()
+    try:
+        yield from suscripcion
+    finally:
+        telemetria.detener()
+        suscripcion.cerrar()
+        hilo.join()
+
+
+async def transmitir_async(agente, capacidad=100, bloquear=False):
+    """Versión ``async for`` de ``transmitir``"""
+    telemetria = agente.telemetria
+    suscripcion = telemetria.suscribir(capacidad, bloquear)
+    hilo = threading.Thread(target=_buscar, args=(agente, telemetria), daemon=True)
+    hilo.start()
+    try:
+        async for evento in suscripcion:
+            yield evento
+    finally:
+        telemetria.detener()
+        suscripcion.cerrar()
+        await asyncio.to_thread(hilo.join)
+
+
+def volcar_jsonl(suscripcion, ruta):
+    """Sumidero: escribe cada evento como una línea JSON en ``ruta`` ('-' para stderr)"""
+    salida = sys.stderr if ruta == "-" else open(ruta, "w", encoding="utf-8")
+    try:
+        for evento in suscripcion:
+            salida.write(json.dumps(evento, ensure_ascii=False) + "\n")
+            salida.flush()
+    finally:
+        if salida is not sys.stderr:
+            salida.close()
@@ -0,0 +1,103 @@
+# test_cobertura.py - Paridad del backend numpy con el de referencia (conjunto de puntos)
+import random
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from cobertura import CoberturaConjunto, CoberturaNumpy
+from modelo import Museo
+from plano import cargar_plano
+
+PLANO = cargar_plano(Path(__file__).with_name("plano_ejemplo.geojson"))
+
+
+def camaras_aleatorias(rng, tamano, radio, n, reales):
+    """Centros que pueden solaparse y salirse del museo hasta un radio"""
+    def coordenada():
+        if reales:
+            return rng.uniform(-radio, tamano + radio)
+        return rng.randint(-int(radio), tamano + int(radio))
+    return [(coordenada(), coordenada()) for _ in range(n)]
+
+
+@pytest.mark.parametrize("semilla", range(40))
+def test_calcular_igual_que_conjunto(semilla):
+    rng = random.Random(semilla)
+    tamano = rng.choice([20, 50, 120])
+    radio = rng.choice([1, 3, 7.5, 15, rng.uniform(0.5, 20)])
+    camaras = camaras_aleatorias(rng, tamano, radio, rng.randint(0, 25), reales=semilla % 2 == 1)
+    # Cámaras repetidas: solapamiento total
+    camaras += rng.sample(camaras, min(2, len(camaras)))
+
+    referencia = CoberturaConjunto(tamano, radio)
+    numpy = CoberturaNumpy(tamano, radio)
+    assert numpy.calcular(camaras) == referencia.calcular(camaras)
+
+
+@pytest.mark.parametrize("vision", [False, True])
+@pytest.mark.parametrize("semilla", range(4))
+def test_calcular_igual_que_conjunto_con_plano(semilla, vision):
+    rng = random.Random(semilla)
+    radio = rng.choice([6, 12.5, 15])
+    camaras = camaras_aleatorias(rng, PLANO.tamano, radio, 8, reales=semilla % 2 == 1)
+
+    referencia = CoberturaConjunto(PLANO.tamano, radio, PLANO, vision)
+    numpy = CoberturaNumpy(PLANO.tamano, radio, PLANO, vision)
+    assert numpy.calcular(camaras) == referencia.calcular(camaras)
+
+
+@pytest.mark.parametrize("semilla", range(10))
+def test_sumar_restar_igual_que_conjunto(semilla):
+    rng = random.Random(semilla)
+    tamano, radio = 60, rng.choice([4, 9.5, 15])
+    camaras = camaras_aleatorias(rng, tamano, radio, 15, reales=semilla % 2 == 1)
+    backends = [CoberturaConjunto(tamano, radio), CoberturaNumpy(tamano, radio)]
+    rejillas = [backend.nueva_rejilla() for backend in backends]
+
+    for camara in camaras:
+        sumas = [backend.sumar(rejilla, camara) for backend, rejilla in zip(backends, rejillas)]
+        assert sumas[0] == sumas[1]
+    for camara in rng.sample(camaras, len(camaras)):
+        restas = [backend.restar(rejilla, camara) for backend, rejilla in zip(backends, rejillas)]
+        assert restas[0] == restas[1]
+
+
+@pytest.mark.parametrize("con_plano", [False, True])
+@pytest.mark.parametrize("semilla", range(6))
+def test_movimientos_lote_igual_que_generar_movimientos(semilla, con_plano):
+    rng = random.Random(semilla)
+    plano = PLANO if con_plano else None
+    tamano = PLANO.tamano if con_plano else 80
+    radio = rng.choice([3, 6, 8.5])
+    museo = Museo(tamano=tamano, num_camaras=20, radio_cobertura=radio, cobertura="numpy", plano=plano)
+    estado = camaras_aleatorias(rng, tamano, radio, 20, reales=semilla % 2 == 1)
+
+    for paso in (1, 5, 2.5):
+        indices, dx, dy = museo.movimientos_lote(estado, paso)
+        lote = [(i, (estado[i][0] + desp_x, estado[i][1] + desp_y))
+                for i, desp_x, desp_y in zip(indices, dx, dy)]
+        assert lote == museo.generar_movimientos(estado, paso=paso)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "conjunto"])
+@pytest.mark.parametrize("con_plano", [False, True])
+@pytest.mark.parametrize("semilla", range(4))
+def test_areas_movimientos_igual_que_mover(semilla, con_plano, backend):
+    rng = random.Random(semilla)
+    plano = PLANO if con_plano else None
+    tamano = PLANO.tamano if con_plano else 80
+    radio = rng.choice([4, 7.5, 12])
+    museo = Museo(tamano=tamano, num_camaras=15, radio_cobertura=radio, cobertura=backend, plano=plano)
+    estado = camaras_aleatorias(rng, tamano, radio, 15, reales=semilla % 2 == 1)
+
+    # factor > 1: rejilla submuestreada (CoberturaReducida)
+    for factor, paso in ((1, 5), (1, 1), (2, 10), (4, 20)):
+        seguidor = museo.crear_seguidor(estado, factor)
+        indices, dx, dy = museo.movimientos_lote(estado, paso)
+        esperadas = []
+        for i, desp_x, desp_y in zip(indices, dx, dy):
+            esperadas.append(seguidor.mover(i, (estado[i][0] + desp_x, estado[i][1] + desp_y)))
+            seguidor.deshacer()
+        assert seguidor.areas_movimientos(indices, dx, dy) == esperadas